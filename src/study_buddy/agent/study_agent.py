@@ -1,7 +1,7 @@
 """Study Agent - LangChain-based agent for study assistance"""
 
 import logging
-from typing import Dict, Any, List, Optional, Literal
+from typing import AsyncIterator, Dict, Any, List, Optional, Literal
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_ollama import ChatOllama
@@ -31,7 +31,8 @@ def create_llm(
     model: str,
     temperature: float = 0.7,
     google_api_key: str = None,
-    ollama_base_url: str = "http://localhost:11434"
+    ollama_base_url: str = "http://localhost:11434",
+    ollama_keep_alive: Optional[str] = "30m",
 ) -> BaseChatModel:
     """
     Factory function to create LLM based on provider.
@@ -42,6 +43,7 @@ def create_llm(
         temperature: LLM temperature
         google_api_key: Google API key (required for Google provider)
         ollama_base_url: Ollama server URL
+        ollama_keep_alive: How long Ollama keeps the model loaded between requests
     
     Returns:
         LangChain chat model instance
@@ -52,6 +54,7 @@ def create_llm(
             model=model,
             base_url=ollama_base_url,
             temperature=temperature,
+            keep_alive=ollama_keep_alive,
         )
     else:
         logger.info(f"Using Google Gemini LLM: {model}")
@@ -113,6 +116,7 @@ class StudyAgent:
         llm_temperature: float = 0.7,
         google_api_key: str = None,
         ollama_base_url: str = "http://localhost:11434",
+        ollama_keep_alive: Optional[str] = "30m",
         max_sessions: int = 100,
     ):
         """
@@ -125,6 +129,7 @@ class StudyAgent:
             llm_temperature: Temperature for LLM generation
             google_api_key: Google API key (required for Google provider)
             ollama_base_url: Ollama server URL
+            ollama_keep_alive: How long Ollama keeps the model loaded between requests
             max_sessions: Maximum number of concurrent sessions
         """
         logger.info(f"Initializing StudyAgent with provider: {llm_provider}, model: {llm_model}")
@@ -141,6 +146,7 @@ class StudyAgent:
             temperature=llm_temperature,
             google_api_key=google_api_key,
             ollama_base_url=ollama_base_url,
+            ollama_keep_alive=ollama_keep_alive,
         )
         
         # Initialize session manager
@@ -232,6 +238,57 @@ class StudyAgent:
                 warning="Processing failed"
             )
     
+    async def stream_explain(self, request: AgentRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process an explain request, yielding the answer as it is generated.
+        
+        Args:
+            request: The agent request (explain mode)
+            
+        Yields:
+            Event dicts: one "start" with session and sources, a "delta" per
+            piece of generated text, then "done" (or "error")
+        """
+        session = self.session_manager.get_or_create_session(request.session_id)
+        if request.doc_id:
+            session.add_doc_id(request.doc_id)
+        session.add_human_message(request.input)
+        
+        tool = self.tools_by_name["explain_concept"]
+        parts: List[str] = []
+        recorded = False
+        try:
+            async for event in tool.astream_explanation(concept=request.input, doc_id=request.doc_id):
+                if "delta" in event:
+                    parts.append(event["delta"])
+                    yield {"type": "delta", "text": event["delta"]}
+                else:
+                    doc_ids = [request.doc_id] if request.doc_id and event["used_document"] else []
+                    yield {
+                        "type": "start",
+                        "session_id": session.session_id,
+                        "sources": event["sources"],
+                        "doc_ids_used": doc_ids,
+                    }
+            
+            message = "".join(parts).strip()
+            session.add_ai_message(message)
+            recorded = True
+            yield {"type": "done", "message": message}
+        except Exception as e:
+            logger.error(f"Error streaming explanation: {e}")
+            error_message = f"An error occurred: {str(e)}"
+            if not recorded:
+                # Keep the history paired: record what was generated, or the error
+                session.add_ai_message("".join(parts).strip() or error_message)
+                recorded = True
+            yield {"type": "error", "message": error_message}
+        finally:
+            # The client went away mid-stream (GeneratorExit / CancelledError):
+            # still pair the question with whatever was generated
+            if not recorded:
+                session.add_ai_message("".join(parts).strip())
+    
     async def _handle_mcq(self, request: AgentRequest, session: Session) -> AgentResponse:
         """Handle MCQ generation request"""
         if not request.doc_id:
@@ -3,7 +3,7 @@
 import json
 import logging
 import re
-from typing import List, Dict, Any, Optional, Type
+from typing import AsyncIterator, List, Dict, Any, Optional, Type
 
 from langchain_core.tools import BaseTool
 from langchain_core.callbacks import CallbackManagerForToolRun
@@ -338,15 +338,8 @@ class ExplainTool(BaseStudyTool):
     Uses document content for context if doc_id is provided, otherwise uses general knowledge."""
     args_schema: Type[BaseModel] = ExplainInput
     
-    def _run(
-        self,
-        concept: str,
-        doc_id: Optional[str] = None,
-        run_manager: Optional[CallbackManagerForToolRun] = None,
-    ) -> Dict[str, Any]:
-        """Explain a concept"""
-        logger.info(f"Explaining concept: {concept}")
-        
+    def _build_prompt(self, concept: str, doc_id: Optional[str]) -> tuple[str, str, List[Any]]:
+        """Build the explanation prompt, returning (prompt, context, sources)"""
         # Get RAG context if doc_id provided
         context = ""
         sources = []
@@ -372,6 +365,19 @@ Respond naturally like you're having a friendly conversation. Keep it:
 - Pure text only - NO markdown, NO bullet points, NO formatting, NO asterisks, NO headers
 
 Just answer their question in a friendly, helpful way:"""
+        
+        return prompt, context, sources
+    
+    def _run(
+        self,
+        concept: str,
+        doc_id: Optional[str] = None,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> Dict[str, Any]:
+        """Explain a concept"""
+        logger.info(f"Explaining concept: {concept}")
+        
+        prompt, context, sources = self._build_prompt(concept, doc_id)
 
         try:
             response = self.llm.invoke(prompt)
@@ -392,6 +398,27 @@ Just answer their question in a friendly, helpful way:"""
                 "explanation": "",
                 "warning": "Failed to generate explanation"
             }
+    
+    async def astream_explanation(
+        self,
+        concept: str,
+        doc_id: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Explain a concept, yielding the answer as it is generated.
+        
+        Yields:
+            {"sources": [...], "used_document": bool} once, then
+            {"delta": str} for each generated piece of text
+        """
+        logger.info(f"Streaming explanation for: {concept}")
+        
+        prompt, context, sources = self._build_prompt(concept, doc_id)
+        yield {"sources": sources[:3] if sources else [], "used_document": bool(context)}
+        
+        async for chunk in self.llm.astream(prompt):
+            if chunk.content:
+                yield {"delta": chunk.content}
 
 
 # ============== Summarize Tool ==============
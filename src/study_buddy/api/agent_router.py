@@ -1,7 +1,10 @@
 """Agent API router for the Study Buddy application"""
 
+import json
+
 from fastapi import APIRouter, HTTPException, Depends, Request
-from typing import Dict, Any, List
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, Any, List
 
 from ..models import AgentRequest, AgentResponse, AgentMode
 from ..agent.study_agent import StudyAgent
@@ -60,6 +63,42 @@ async def process_agent_request(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@agent_router.post("/stream")
+async def stream_agent_request(
+    request: AgentRequest,
+    agent: StudyAgent = Depends(get_agent)
+) -> StreamingResponse:
+    """
+    Stream an explain-mode answer as Server-Sent Events.
+    
+    Each event is a JSON object with a **type**:
+    - **start**: session_id, sources and doc_ids_used
+    - **delta**: the next piece of generated text
+    - **done**: the full message
+    - **error**: message describing the failure
+    """
+    if request.mode != AgentMode.EXPLAIN:
+        raise HTTPException(
+            status_code=400,
+            detail="Streaming is only supported for explain mode."
+        )
+    if not request.input.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Input cannot be empty. Please provide a topic or question."
+        )
+    
+    async def event_stream() -> AsyncIterator[str]:
+        async for event in agent.stream_explain(request):
+            yield f"data: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @agent_router.get("/sessions", response_model=List[Dict[str, Any]])
 async def list_sessions(
     agent: StudyAgent = Depends(get_agent)
@@ -1,7 +1,8 @@
 """API routers for the Study Buddy application"""
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Request
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from urllib.parse import unquote
 import tempfile
 import shutil
 import re
@@ -58,6 +59,19 @@ def get_pipeline(request: Request) -> RAGPipeline:
     return request.app.state.pipeline
 
 
+async def _stream_body_to_file(request: Request, dest) -> None:
+    """Write a raw request body to a file, enforcing the size limit while streaming."""
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_FILE_SIZE_BYTES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File too large. Maximum {MAX_FILE_SIZE_MB} MB allowed."
+            )
+        dest.write(chunk)
+
+
 # Health check endpoints
 @health_router.get("/health")
 async def health_check() -> Dict[str, str]:
@@ -86,38 +100,51 @@ async def readiness_check(
 # RAG endpoints
 @rag_router.post("/ingest/pdf", response_model=IngestResponse)
 async def ingest_pdf(
-    file: UploadFile = File(...),
+    request: Request,
+    file: Optional[UploadFile] = File(None),
     pipeline: RAGPipeline = Depends(get_pipeline)
 ) -> IngestResponse:
-    """Upload and ingest a PDF file. Document ID is auto-generated from filename."""
-    if not file.filename.lower().endswith(".pdf"):
+    """
+    Upload and ingest a PDF file. Document ID is auto-generated from filename.
+    
+    Accepts either a multipart form with a `file` field, or the raw PDF as the
+    request body with its URL-encoded name in an `X-Filename` header. The raw
+    form lets browsers stream the file instead of buffering a FormData body.
+    """
+    filename = file.filename if file is not None else unquote(request.headers.get("x-filename", ""))
+    
+    if not filename or not filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="File must be a PDF")
     
-    # Check file size by reading content-length header or measuring
-    file_size = 0
-    if hasattr(file, 'size') and file.size:
-        file_size = file.size
-    else:
-        # Read to measure size (will need to seek back)
-        content = await file.read()
-        file_size = len(content)
-        await file.seek(0)  # Reset for later reading
-    
-    if file_size > MAX_FILE_SIZE_BYTES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum {MAX_FILE_SIZE_MB} MB allowed."
-        )
+    if file is not None:
+        # Check file size by reading content-length header or measuring
+        file_size = 0
+        if hasattr(file, 'size') and file.size:
+            file_size = file.size
+        else:
+            # Read to measure size (will need to seek back)
+            content = await file.read()
+            file_size = len(content)
+            await file.seek(0)  # Reset for later reading
+        
+        if file_size > MAX_FILE_SIZE_BYTES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File too large. Maximum {MAX_FILE_SIZE_MB} MB allowed."
+            )
     
     # Auto-generate doc_id from filename
-    doc_id = generate_doc_id_from_filename(file.filename)
+    doc_id = generate_doc_id_from_filename(filename)
     
     # Save uploaded file temporarily
     tmp_path = None
     try:
         with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            shutil.copyfileobj(file.file, tmp_file)
             tmp_path = Path(tmp_file.name)
+            if file is not None:
+                shutil.copyfileobj(file.file, tmp_file)
+            else:
+                await _stream_body_to_file(request, tmp_file)
         
         result = pipeline.ingest_pdf(tmp_path, doc_id)
         
@@ -22,6 +22,7 @@ class Settings(BaseSettings):
     # Ollama Configuration
     ollama_base_url: str = "http://localhost:11434"  # Ollama server URL
     ollama_llm_model: str = "gemma3:4b"  # Ollama LLM model
+    ollama_keep_alive: str = "30m"  # How long Ollama keeps the LLM loaded between requests
     ollama_embedding_model: str = "nomic-embed-text:latest"  # Ollama embedding model
     ollama_embedding_dimension: int = 768  # Dimension for nomic-embed-text
     
@@ -68,6 +69,7 @@ class Settings(BaseSettings):
     
     # RAG Configuration
     top_k_results: int = 3
+    faiss_use_gpu: bool = False  # Serve FAISS indices from GPU (requires faiss-gpu)
     
     # CORS Configuration
     cors_origins: str = "*"  # Comma-separated list of allowed origins, or "*" for all
@@ -1,14 +1,16 @@
 """Study Buddy FastAPI Application"""
 
 from contextlib import asynccontextmanager
+import hashlib
+import json
 import logging
 import sys
 
 from typing import Literal
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from pydantic import BaseModel
 
 from .api.routers import rag_router, health_router
@@ -16,8 +18,8 @@ from .api.agent_router import agent_router
 from .config.settings import get_settings
 from .rag_qa.qa import RAGPipeline
 from .agent.study_agent import StudyAgent
-from .utils.health_check import check_ollama_connection
-from .ui.app_ui import APP_HTML, ui_router
+from .utils.health_check import check_ollama_connection, close_http_client
+from .ui.app_ui import app_html_response, ui_router
 
 
 def setup_logging() -> None:
@@ -80,7 +82,8 @@ async def build_components(app: FastAPI, settings):
         ollama_embedding_model=settings.ollama_embedding_model,
         faiss_index_path=settings.faiss_index_path,
         metadata_path=settings.metadata_path,
-        top_k_results=settings.top_k_results
+        top_k_results=settings.top_k_results,
+        use_gpu=settings.faiss_use_gpu,
     )
     
     logger.info("RAG Pipeline initialized successfully")
@@ -93,6 +96,7 @@ async def build_components(app: FastAPI, settings):
         llm_temperature=settings.llm_temperature,
         google_api_key=settings.google_api_key,
         ollama_base_url=settings.ollama_base_url,
+        ollama_keep_alive=settings.ollama_keep_alive,
         max_sessions=settings.agent_max_sessions,
     )
     
@@ -124,6 +128,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Study Buddy API...")
     app.state.study_agent = None
     app.state.pipeline = None
+    await close_http_client()
 
 
 app = FastAPI(
@@ -157,16 +162,24 @@ app.include_router(ui_router)
 
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request) -> Response:
     """Root endpoint serving the Study Buddy UI"""
-    return HTMLResponse(content=APP_HTML)
+    return app_html_response(request)
 
 
 @app.get("/providers")
-async def get_providers():
+async def get_providers(request: Request) -> Response:
     """Get current provider configuration"""
     settings = get_settings()
-    return settings.get_provider_info()
+    body = json.dumps(settings.get_provider_info()).encode("utf-8")
+    
+    # Always revalidate (a switch can change it any time), but answer unchanged configs with a 304
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.post("/providers/switch")
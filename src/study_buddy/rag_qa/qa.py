@@ -1,6 +1,6 @@
 """Minimal RAG pipeline leveraging LangChain for all heavy lifting"""
 
-from typing import List, Dict, Any, Optional, Literal
+from typing import List, Dict, Any, Optional, Literal, Tuple
 from pathlib import Path
 import logging
 
@@ -26,7 +26,8 @@ class RAGPipeline:
         ollama_embedding_model: str = "nomic-embed-text:latest",
         faiss_index_path: str | Path = None,
         metadata_path: str | Path = None,
-        top_k_results: int = 3
+        top_k_results: int = 3,
+        use_gpu: bool = False
     ):
         """
         Initialize RAG pipeline.
@@ -42,6 +43,7 @@ class RAGPipeline:
             faiss_index_path: Path to store FAISS indices
             metadata_path: Path to store metadata
             top_k_results: Number of results to return in queries
+            use_gpu: Serve FAISS indices from the GPU when available
         """
         logger.info(f"Initializing RAG Pipeline with {embedding_provider} embeddings")
         
@@ -71,6 +73,7 @@ class RAGPipeline:
             google_embedding_model=google_embedding_model,
             ollama_base_url=ollama_base_url,
             ollama_embedding_model=ollama_embedding_model,
+            use_gpu=use_gpu,
         )
         self.metadata_store = MetadataStore(storage_path=metadata_path)
         
@@ -118,28 +121,48 @@ class RAGPipeline:
         try:
             logger.info(f"Querying {doc_id}")
             results = self.vectorstore.search(doc_id, question, k)
-            
-            if not results:
-                return {"answer": "No relevant information found", "citations": [], "doc_id": doc_id}
-            
-            citations = [
-                {
-                    "chunk_id": doc.metadata.get("chunk_id", f"chunk_{i}"),
-                    "score": float(score),
-                    "text": doc.page_content[:200]
-                }
-                for i, (doc, score) in enumerate(results)
-            ]
-            
-            # Simple answer from context
-            context = "\n\n".join([doc.page_content for doc, _ in results])
-            answer = f"Based on retrieved context:\n\n{context}"
-            
-            return {"answer": answer, "citations": citations, "doc_id": doc_id}
+            return self._build_answer(doc_id, results)
         except Exception as e:
             logger.error(f"Query error: {e}")
             return {"answer": f"Error: {str(e)}", "citations": [], "doc_id": doc_id}
     
+    def query_batch(self, doc_id: str, questions: List[str], k: int = None) -> List[Dict[str, Any]]:
+        """Query document with several questions using one batched index search"""
+        k = k or self.top_k_results
+        
+        try:
+            logger.info(f"Batch querying {doc_id} ({len(questions)} questions)")
+            batch_results = self.vectorstore.search_batch(doc_id, questions, k)
+            return [self._build_answer(doc_id, results) for results in batch_results]
+        except Exception as e:
+            logger.error(f"Batch query error: {e}")
+            return [
+                {"answer": f"Error: {str(e)}", "citations": [], "doc_id": doc_id}
+                for _ in questions
+            ]
+    
+    def _build_answer(self, doc_id: str, results: List[Tuple[Any, float]]) -> Dict[str, Any]:
+        """Build the answer/citations payload from search results"""
+        if not results:
+            return {"answer": "No relevant information found", "citations": [], "doc_id": doc_id}
+        
+        # Build citations and context parts in a single pass over the results
+        citations = [None] * len(results)
+        parts = [None] * len(results)
+        for i, (doc, score) in enumerate(results):
+            parts[i] = doc.page_content
+            citations[i] = {
+                "chunk_id": doc.metadata.get("chunk_id", f"chunk_{i}"),
+                "score": float(score),
+                "text": doc.page_content[:200]
+            }
+        
+        # Simple answer from context
+        context = "\n\n".join(parts)
+        answer = f"Based on retrieved context:\n\n{context}"
+        
+        return {"answer": answer, "citations": citations, "doc_id": doc_id}
+    
     def delete_document(self, doc_id: str) -> Dict[str, Any]:
         """Delete document"""
         try:
@@ -1,8 +1,12 @@
 """Vector store wrapper - uses LangChain's FAISS integration with Google/Ollama embeddings"""
 
 from pathlib import Path
-from typing import List, Any, Tuple, Literal
+from typing import List, Any, Tuple, Literal, Dict
 from collections import OrderedDict
+import hashlib
+import os
+import faiss
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
@@ -15,6 +19,47 @@ logger = logging.getLogger(__name__)
 # Maximum number of FAISS indices to keep in memory
 MAX_CACHED_INDICES = 20
 
+# Maximum number of query embeddings to keep in memory
+MAX_CACHED_QUERY_EMBEDDINGS = 256
+
+# Suffix of the per-document file caching chunk embeddings by content hash
+EMBEDDING_CACHE_SUFFIX = ".embeddings.npz"
+
+
+def _search_faiss_index(vs: FAISS, query_vectors: np.ndarray, k: int) -> List[List[Tuple[Document, float]]]:
+    """
+    Run one FAISS search for several query vectors against a LangChain vectorstore.
+    
+    LangChain's FAISS wrapper only searches one vector at a time, so this mirrors
+    FAISS.similarity_search_with_score_by_vector (langchain_community) on a whole
+    matrix. It is the only place relying on the wrapper's internals: index,
+    index_to_docstore_id, docstore and _normalize_L2.
+    
+    Args:
+        vs: Vectorstore to search
+        query_vectors: float32 matrix with one query embedding per row
+        k: Number of results per query
+        
+    Returns:
+        One list of (document, score) pairs per query, in query order
+    """
+    if vs._normalize_L2:
+        faiss.normalize_L2(query_vectors)
+    scores, indices = vs.index.search(query_vectors, k)
+    
+    batch_results = []
+    for row_scores, row_indices in zip(scores, indices):
+        results = []
+        for score, idx in zip(row_scores, row_indices):
+            # FAISS pads with -1 when the index holds fewer than k vectors
+            if idx == -1:
+                continue
+            doc = vs.docstore.search(vs.index_to_docstore_id[idx])
+            if isinstance(doc, Document):
+                results.append((doc, float(score)))
+        batch_results.append(results)
+    return batch_results
+
 
 def create_embeddings(
     provider: Literal["google", "ollama"],
@@ -65,14 +110,13 @@ class LRUCache:
         return None
     
     def put(self, key: str, value: FAISS) -> None:
-        """Add item, evicting oldest if at capacity"""
+        """Add or replace item, evicting oldest if at capacity"""
         if key in self._cache:
             self._cache.move_to_end(key)
-        else:
-            if len(self._cache) >= self.max_size:
-                evicted_key, _ = self._cache.popitem(last=False)
-                logger.info(f"Evicted index '{evicted_key}' from cache (LRU)")
-            self._cache[key] = value
+        elif len(self._cache) >= self.max_size:
+            evicted_key, _ = self._cache.popitem(last=False)
+            logger.info(f"Evicted index '{evicted_key}' from cache (LRU)")
+        self._cache[key] = value
     
     def delete(self, key: str) -> bool:
         """Remove item from cache"""
@@ -96,7 +140,8 @@ class FAISSVectorStore:
         google_embedding_model: str = "gemini-embedding-001",
         ollama_base_url: str = "http://localhost:11434",
         ollama_embedding_model: str = "nomic-embed-text:latest",
-        max_cached_indices: int = MAX_CACHED_INDICES
+        max_cached_indices: int = MAX_CACHED_INDICES,
+        use_gpu: bool = False
     ):
         """
         Initialize FAISS vectorstore.
@@ -109,12 +154,16 @@ class FAISSVectorStore:
             ollama_base_url: Ollama server URL
             ollama_embedding_model: Ollama embedding model name
             max_cached_indices: Maximum number of indices to keep in memory
+            use_gpu: Serve cached indices from GPU 0 (needs a GPU-enabled faiss build)
         """
         self.index_path = Path(index_path)
         self.index_path.mkdir(parents=True, exist_ok=True)
         
         # Create embeddings based on provider
         self.embedding_provider = embedding_provider
+        self.embedding_model = (
+            ollama_embedding_model if embedding_provider == "ollama" else google_embedding_model
+        )
         self.embeddings = create_embeddings(
             provider=embedding_provider,
             google_api_key=google_api_key,
@@ -126,6 +175,18 @@ class FAISSVectorStore:
         # LRU cache for vectorstores (prevents unbounded memory growth)
         self.vectorstores = LRUCache(max_size=max_cached_indices)
         
+        # Repeated questions (and the tools' fallback queries) skip the embedding call
+        self._query_embeddings: OrderedDict[str, List[float]] = OrderedDict()
+        
+        # GPU resources are shared by all indices moved to the GPU
+        self._gpu_resources = None
+        if use_gpu:
+            if hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0:
+                self._gpu_resources = faiss.StandardGpuResources()
+                logger.info("FAISS indices will be served from GPU")
+            else:
+                logger.warning("use_gpu requested but faiss has no GPU support; using CPU indices")
+        
         logger.info(f"FAISS VectorStore initialized at {self.index_path} (provider: {embedding_provider}, max cache: {max_cached_indices})")
     
     def create_index(
@@ -134,12 +195,23 @@ class FAISSVectorStore:
         chunks: List[Any],
         force_recreate: bool = False
     ) -> None:
-        """Create FAISS index from chunks"""
+        """
+        Create FAISS index from chunks.
+        
+        An existing index is reused unless force_recreate is set or the chunk
+        texts differ from the ones it was built from; a rebuild only embeds
+        the chunks whose content is not already cached.
+        """
         index_file = self.index_path / f"{doc_id}.faiss"
+        texts = [c.text for c in chunks]
+        hashes = [self._hash_text(t) for t in texts]
         
         if index_file.exists() and not force_recreate:
-            self.load_index(doc_id)
-            return
+            cached_hashes, _ = self._load_embedding_cache(doc_id)
+            if not chunks or cached_hashes == hashes:
+                self.load_index(doc_id)
+                return
+            logger.info(f"Chunks changed for {doc_id}, rebuilding index")
         
         if not chunks:
             logger.warning(f"No chunks for {doc_id}")
@@ -148,34 +220,167 @@ class FAISSVectorStore:
         logger.info(f"Creating index for {doc_id}")
         
         try:
-            documents = [
-                Document(page_content=c.text, metadata=c.metadata)
-                for c in chunks
-            ]
-            vectorstore = FAISS.from_documents(documents, self.embeddings)
-            self.vectorstores.put(doc_id, vectorstore)
+            vectors = self._embed_chunks(doc_id, texts, hashes)
+            # The ndarray rows are stacked into one float32 matrix and added to the index in one call
+            vectorstore = FAISS.from_embeddings(
+                zip(texts, vectors),
+                self.embeddings,
+                metadatas=[c.metadata for c in chunks]
+            )
+            # Save before any GPU transfer - GPU indices cannot be written to disk
             vectorstore.save_local(str(self.index_path), index_name=doc_id)
+            self.vectorstores.put(doc_id, self._to_gpu(vectorstore))
             logger.info(f"Index created for {doc_id}")
         except Exception as e:
             logger.error(f"Error creating index: {e}")
             raise
     
-    def search(self, doc_id: str, query: str, k: int = 3) -> List[Tuple[Document, float]]:
-        """Search similar documents using LangChain"""
+    @staticmethod
+    def _hash_text(text: str) -> str:
+        """Content hash identifying a chunk text in the embedding cache"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    def _embed_chunks(self, doc_id: str, texts: List[str], hashes: List[str]) -> np.ndarray:
+        """
+        Embed chunk texts, reusing cached vectors for unchanged chunks.
+        
+        Only texts whose content hash is not in the document's embedding
+        cache are sent to the embedding provider.
+        
+        Args:
+            doc_id: Document identifier
+            texts: Chunk texts in index order
+            hashes: Content hash of each text
+            
+        Returns:
+            Array of shape (len(texts), dim) with one vector per text
+        """
+        _, cached = self._load_embedding_cache(doc_id)
+        
+        # Deduplicate so repeated chunks are embedded only once
+        missing: Dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in cached and text_hash not in missing:
+                missing[text_hash] = text
+        
+        if missing:
+            new_vectors = self.embeddings.embed_documents(list(missing.values()))
+            cached.update(zip(missing.keys(), np.asarray(new_vectors, dtype=np.float32)))
+        
+        logger.info(f"Embedded {len(missing)} new chunks for {doc_id} ({len(texts) - len(missing)} reused)")
+        
+        vectors = np.stack([cached[h] for h in hashes])
+        self._save_embedding_cache(doc_id, hashes, vectors)
+        return vectors
+    
+    def _load_embedding_cache(self, doc_id: str) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """
+        Load the content-hash -> vector cache for a document.
+        
+        Returns:
+            The chunk hashes in the order the index was built from, and the
+            hash -> vector mapping (both empty when there is no usable cache)
+        """
+        cache_file = self.index_path / f"{doc_id}{EMBEDDING_CACHE_SUFFIX}"
+        if not cache_file.exists():
+            return [], {}
+        
+        try:
+            with np.load(cache_file, allow_pickle=False) as data:
+                # Vectors from a different embedding model are not comparable
+                if str(data["model"]) != f"{self.embedding_provider}:{self.embedding_model}":
+                    return [], {}
+                hashes = data["hashes"].tolist()
+                return hashes, dict(zip(hashes, data["vectors"]))
+        except Exception as e:
+            logger.warning(f"Could not load embedding cache for {doc_id}: {e}")
+            return [], {}
+    
+    def _save_embedding_cache(self, doc_id: str, hashes: List[str], vectors: np.ndarray) -> None:
+        """Atomically write the content-hash -> vector cache for a document"""
+        cache_file = self.index_path / f"{doc_id}{EMBEDDING_CACHE_SUFFIX}"
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        
+        try:
+            with open(tmp_file, "wb") as f:
+                np.savez(
+                    f,
+                    hashes=np.array(hashes),
+                    vectors=vectors,
+                    model=np.array(f"{self.embedding_provider}:{self.embedding_model}")
+                )
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.warning(f"Could not save embedding cache for {doc_id}: {e}")
+            tmp_file.unlink(missing_ok=True)
+    
+    def _to_gpu(self, vectorstore: FAISS) -> FAISS:
+        """Move a vectorstore's index onto the GPU when GPU serving is enabled"""
+        if self._gpu_resources is not None:
+            vectorstore.index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, vectorstore.index)
+        return vectorstore
+    
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a query, reusing the vector for recently seen queries"""
+        cached = self._query_embeddings.get(query)
+        if cached is not None:
+            self._query_embeddings.move_to_end(query)
+            return cached
+        
+        embedding = self.embeddings.embed_query(query)
+        self._query_embeddings[query] = embedding
+        if len(self._query_embeddings) > MAX_CACHED_QUERY_EMBEDDINGS:
+            self._query_embeddings.popitem(last=False)
+        return embedding
+    
+    def _get_vectorstore(self, doc_id: str) -> FAISS | None:
+        """Get a cached vectorstore, loading it from disk if needed"""
         vs = self.vectorstores.get(doc_id)
         if vs is None:
             self.load_index(doc_id)
             vs = self.vectorstores.get(doc_id)
+        return vs
+    
+    def search(self, doc_id: str, query: str, k: int = 3) -> List[Tuple[Document, float]]:
+        """Search similar documents using LangChain"""
+        vs = self._get_vectorstore(doc_id)
         
         if vs is None:
             return []
         
         try:
-            return vs.similarity_search_with_score(query, k=k)
+            return vs.similarity_search_with_score_by_vector(self._embed_query(query), k=k)
         except Exception as e:
             logger.error(f"Search error: {e}")
             return []
     
+    def search_batch(self, doc_id: str, queries: List[str], k: int = 3) -> List[List[Tuple[Document, float]]]:
+        """
+        Search several queries against one index with a single FAISS call.
+        
+        Args:
+            doc_id: Document identifier
+            queries: Query strings
+            k: Number of results per query
+            
+        Returns:
+            One list of (document, score) pairs per query, in query order
+        """
+        vs = self._get_vectorstore(doc_id)
+        
+        if vs is None or not queries:
+            return [[] for _ in queries]
+        
+        try:
+            query_vectors = np.array(
+                [self._embed_query(q) for q in queries],
+                dtype=np.float32
+            )
+            return _search_faiss_index(vs, query_vectors, k)
+        except Exception as e:
+            logger.error(f"Batch search error: {e}")
+            return [[] for _ in queries]
+    
     def load_index(self, doc_id: str) -> bool:
         """Load FAISS index from disk"""
         try:
@@ -185,7 +390,7 @@ class FAISSVectorStore:
                 index_name=doc_id,
                 allow_dangerous_deserialization=True
             )
-            self.vectorstores.put(doc_id, vs)
+            self.vectorstores.put(doc_id, self._to_gpu(vs))
             return True
         except Exception as e:
             logger.warning(f"Could not load index for {doc_id}: {e}")
@@ -195,7 +400,7 @@ class FAISSVectorStore:
         """Delete FAISS index"""
         self.vectorstores.delete(doc_id)
         
-        for file in [f"{doc_id}.faiss", f"{doc_id}.pkl"]:
+        for file in [f"{doc_id}.faiss", f"{doc_id}.pkl", f"{doc_id}{EMBEDDING_CACHE_SUFFIX}"]:
             fp = self.index_path / file
             if fp.exists():
                 fp.unlink()
@@ -1,11 +1,20 @@
 import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
+from collections import OrderedDict
 from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of documents whose chunk lookup tables are kept in memory
+MAX_CACHED_DOCUMENTS = 20
+
+
+def _copy_chunk(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a cached chunk dict and its nested metadata dict for a caller"""
+    return {**chunk, "metadata": dict(chunk.get("metadata", {}))}
+
 
 class MetadataStore:
     """Handles storage and retrieval of chunk metadata"""
@@ -19,6 +28,10 @@ class MetadataStore:
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        
+        # doc_id -> chunk lookup table, invalidated when the metadata file changes
+        self._chunk_tables: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        
         logger.info(f"Metadata store initialized at: {self.storage_path}")
     
     def save_metadata(
@@ -42,6 +55,8 @@ class MetadataStore:
             "chunks": chunks_metadata
         }
         
+        self._chunk_tables.pop(doc_id, None)
+        
         try:
             with open(metadata_file, 'w', encoding='utf-8') as f:
                 json.dump(metadata_package, f, indent=2, ensure_ascii=False)
@@ -88,16 +103,16 @@ class MetadataStore:
             chunk_id: Chunk identifier
             
         Returns:
-            Chunk metadata or None if not found
+            Copy of the chunk metadata or None if not found
         """
-        doc_metadata = self.load_metadata(doc_id)
+        table = self._get_chunk_table(doc_id)
         
-        if not doc_metadata:
+        if not table:
             return None
         
-        for chunk in doc_metadata.get("chunks", []):
-            if chunk.get("chunk_id") == chunk_id:
-                return chunk
+        chunk = table["by_id"].get(chunk_id)
+        if chunk is not None:
+            return _copy_chunk(chunk)
         
         logger.warning(f"Chunk {chunk_id} not found in doc_id: {doc_id}")
         return None
@@ -110,14 +125,14 @@ class MetadataStore:
             doc_id: Document identifier
             
         Returns:
-            List of chunk metadata dictionaries
+            List of chunk metadata dictionaries (copies, safe to modify)
         """
-        doc_metadata = self.load_metadata(doc_id)
+        table = self._get_chunk_table(doc_id)
         
-        if not doc_metadata:
+        if not table:
             return []
         
-        return doc_metadata.get("chunks", [])
+        return [_copy_chunk(c) for c in table["chunks"]]
     
     def delete_metadata(self, doc_id: str) -> bool:
         """
@@ -130,6 +145,7 @@ class MetadataStore:
             True if deleted successfully, False otherwise
         """
         metadata_file = self.storage_path / f"{doc_id}_metadata.json"
+        self._chunk_tables.pop(doc_id, None)
         
         if not metadata_file.exists():
             logger.warning(f"Metadata file not found for deletion: {doc_id}")
@@ -168,12 +184,59 @@ class MetadataStore:
             chunk_index: Index of the chunk
             
         Returns:
-            Chunk metadata or None if not found
+            Copy of the chunk metadata or None if not found
         """
-        chunks = self.get_all_chunks_metadata(doc_id)
+        table = self._get_chunk_table(doc_id)
         
-        for chunk in chunks:
-            if chunk.get("chunk_index") == chunk_index:
-                return chunk
+        if not table:
+            return None
         
-        return None
+        chunk = table["by_index"].get(chunk_index)
+        return _copy_chunk(chunk) if chunk is not None else None
+    
+    def _get_chunk_table(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the chunk lookup table for a document.
+        
+        The table holds the chunk list plus chunk_id and chunk_index maps so
+        single-chunk lookups are O(1) instead of a scan over the parsed file.
+        It is rebuilt only when the metadata file's mtime changes, so the
+        cached dicts must not leak to callers - public getters return copies.
+        
+        Args:
+            doc_id: Document identifier
+            
+        Returns:
+            Dict with "chunks", "by_id" and "by_index", or None if not found
+        """
+        metadata_file = self.storage_path / f"{doc_id}_metadata.json"
+        
+        try:
+            mtime = metadata_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._chunk_tables.pop(doc_id, None)
+            logger.warning(f"Metadata file not found for doc_id: {doc_id}")
+            return None
+        
+        table = self._chunk_tables.get(doc_id)
+        if table is not None and table["mtime"] == mtime:
+            self._chunk_tables.move_to_end(doc_id)
+            return table
+        
+        doc_metadata = self.load_metadata(doc_id)
+        if not doc_metadata:
+            return None
+        
+        chunks = doc_metadata.get("chunks", [])
+        table = {
+            "mtime": mtime,
+            "chunks": chunks,
+            "by_id": {c.get("chunk_id"): c for c in chunks},
+            "by_index": {c.get("chunk_index"): c for c in chunks},
+        }
+        
+        self._chunk_tables[doc_id] = table
+        if len(self._chunk_tables) > MAX_CACHED_DOCUMENTS:
+            self._chunk_tables.popitem(last=False)
+        
+        return table
@@ -1,23 +1,145 @@
 """Cute pastel single-page UI served from FastAPI - Vanilla HTML/CSS/JS."""
 
-from fastapi import APIRouter
-from fastapi.responses import HTMLResponse
+import gzip
+import hashlib
+import re
+from email.utils import formatdate
+from typing import Dict, Optional, Tuple
+
+from fastapi import APIRouter, Request
+from fastapi.responses import HTMLResponse, Response
 
 
 ui_router = APIRouter()
 
 
-APP_HTML = r"""<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="UTF-8" />
-  <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-  <title>Study Buddy - Chat with Your Docs</title>
-  <link rel="preconnect" href="https://fonts.googleapis.com" />
-  <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin />
-  <link href="https://fonts.googleapis.com/css2?family=Nunito:wght@400;500;600;700&family=Rubik:wght@500;600;700;800&display=swap" rel="stylesheet" />
-  <style>
+class StaticAsset:
+    """A UI asset encoded, compressed and fingerprinted once at import."""
+    
+    def __init__(
+        self,
+        content: str,
+        media_type: str,
+        cache_control: str,
+        extra_headers: Optional[Dict[str, str]] = None,
+        versioned_cache_control: Optional[str] = None
+    ):
+        """
+        Prepare an asset for serving.
+        
+        Args:
+            content: Asset source text
+            media_type: Content-Type to serve it with
+            cache_control: Cache-Control header value
+            extra_headers: Additional headers sent with full (200) responses
+            versioned_cache_control: Cache-Control used instead when the request's
+                ?v= matches this asset's version
+        """
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.body = content.encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, compresslevel=9)
+        
+        digest = hashlib.sha256(self.body).hexdigest()
+        # Each encoding is a different byte sequence, so each gets its own strong ETag
+        self.etag = f'"{digest[:16]}"'
+        self.gzip_etag = f'"{digest[:16]}-gz"'
+        self.version = digest[:8]  # cache-busting query value for asset URLs
+        self.last_modified = formatdate(usegmt=True)
+        
+        # Header sets are fixed too, so requests only pick one
+        self._extra_headers = extra_headers or {}
+        self._header_sets = self._build_headers(cache_control)
+        self._versioned_header_sets = (
+            self._build_headers(versioned_cache_control) if versioned_cache_control else None
+        )
+    
+    def _build_headers(self, cache_control: str) -> Dict[str, Tuple[Dict[str, str], Dict[str, str]]]:
+        """Build the (304, 200) header sets of each encoding, keyed by its ETag."""
+        not_modified_headers = {
+            "Vary": "Accept-Encoding",
+            "Cache-Control": cache_control,
+            "ETag": self.etag,
+            "Last-Modified": self.last_modified,
+        }
+        headers = {
+            **not_modified_headers,
+            **self._extra_headers,
+            "Content-Type": f"{self.media_type}; charset=utf-8",
+            "Content-Length": str(len(self.body)),
+        }
+        gzip_not_modified_headers = {**not_modified_headers, "ETag": self.gzip_etag}
+        gzip_headers = {
+            **headers,
+            "ETag": self.gzip_etag,
+            "Content-Encoding": "gzip",
+            "Content-Length": str(len(self.gzip_body)),
+        }
+        return {
+            self.etag: (not_modified_headers, headers),
+            self.gzip_etag: (gzip_not_modified_headers, gzip_headers),
+        }
+    
+    def response(self, request: Request) -> Response:
+        """Build the response, sending the precompressed body when gzip is accepted."""
+        # Only a URL naming this exact version may be cached as immutable; a stale
+        # page asking for an older ?v= must not pin the current body under it
+        header_sets = self._header_sets
+        if self._versioned_header_sets and request.query_params.get("v") == self.version:
+            header_sets = self._versioned_header_sets
+        
+        use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+        etag, other_etag = (self.gzip_etag, self.etag) if use_gzip else (self.etag, self.gzip_etag)
+        
+        # Returning clients already have this exact asset, in either encoding;
+        # the 304 names the one they hold
+        matched = _matching_etag(request.headers.get("if-none-match", ""), etag, other_etag)
+        if matched:
+            return Response(status_code=304, headers=header_sets[matched][0])
+        
+        return Response(
+            content=self.gzip_body if use_gzip else self.body,
+            headers=header_sets[etag][1]
+        )
+
+
+def _matching_etag(if_none_match: str, *etags: str) -> Optional[str]:
+    """Return the first of etags an If-None-Match header matches (weak comparison), if any."""
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    for etag in etags:
+        if "*" in candidates or etag in candidates:
+            return etag
+    return None
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and formatting whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def _minify_html(html: str) -> str:
+    """Strip comments and indentation between tags (keeps one space, so rendering is unchanged)."""
+    html = re.sub(r"<!--.*?-->", "", html, flags=re.DOTALL)
+    return re.sub(r">\s+<", "> <", html).strip()
+
+
+# Above-the-fold rules, inlined in <head> so the chat layout paints without
+# waiting on another request
+CRITICAL_CSS = r"""
     * { box-sizing: border-box; }
+
+    :root {
+      --shadow-md: 0 6px 16px rgba(0, 0, 0, 0.1);
+      --shadow-lg: 0 8px 20px rgba(0, 0, 0, 0.1);
+      --border-pink: 4px solid #ffc1e3;
+      --gradient-blue: linear-gradient(135deg, #60a5fa, #a78bfa);
+      --text-muted: #6b6674;
+      --text-strong: #1f2937;
+    }
     
     body {
       margin: 0;
@@ -37,9 +159,8 @@ APP_HTML = r"""<!DOCTYPE html>
     /* ===== SIDEBAR ===== */
     .sidebar {
       width: 320px;
-      background: rgba(255, 255, 255, 0.6);
-      backdrop-filter: blur(10px);
-      border-right: 4px solid #ffc1e3;
+      background: rgba(255, 255, 255, 0.85);
+      border-right: var(--border-pink);
       display: flex;
       flex-direction: column;
       overflow: hidden;
@@ -47,7 +168,7 @@ APP_HTML = r"""<!DOCTYPE html>
 
     .sidebar-header {
       padding: 24px;
-      border-bottom: 4px solid #ffc1e3;
+      border-bottom: var(--border-pink);
       background: linear-gradient(135deg, rgba(255, 193, 227, 0.15), rgba(199, 210, 254, 0.15));
     }
 
@@ -65,7 +186,7 @@ APP_HTML = r"""<!DOCTYPE html>
       background: linear-gradient(135deg, #ff9ecb, #c7d2fe, #7dd3fc);
       display: grid;
       place-items: center;
-      box-shadow: 0 8px 20px rgba(0, 0, 0, 0.1);
+      box-shadow: var(--shadow-lg);
       font-size: 22px;
     }
 
@@ -83,7 +204,7 @@ APP_HTML = r"""<!DOCTYPE html>
     .brand-text p {
       margin: 4px 0 0 0;
       font-size: 12px;
-      color: #6b6674;
+      color: var(--text-muted);
     }
 
     .new-chat-btn {
@@ -122,6 +243,10 @@ APP_HTML = r"""<!DOCTYPE html>
       cursor: pointer;
       transition: all 0.2s ease;
       position: relative;
+      /* Skip layout/paint for conversations scrolled out of view */
+      content-visibility: auto;
+      contain-intrinsic-size: auto 88px;
+      contain: layout paint style;
     }
 
     .conv-item:hover {
@@ -132,7 +257,7 @@ APP_HTML = r"""<!DOCTYPE html>
     .conv-item.active {
       background: linear-gradient(135deg, #fce7f3, #e9d5ff);
       border-color: #ff6b9d;
-      box-shadow: 0 6px 16px rgba(0, 0, 0, 0.1);
+      box-shadow: var(--shadow-md);
     }
 
     .conv-item.unread::before {
@@ -149,7 +274,7 @@ APP_HTML = r"""<!DOCTYPE html>
     .conv-title {
       font-weight: 700;
       font-size: 14px;
-      color: #1f2937;
+      color: var(--text-strong);
       margin-bottom: 4px;
       font-family: 'Rubik', sans-serif;
     }
@@ -170,10 +295,10 @@ APP_HTML = r"""<!DOCTYPE html>
 
     .sidebar-footer {
       padding: 16px 24px;
-      border-top: 4px solid #ffc1e3;
+      border-top: var(--border-pink);
       background: linear-gradient(135deg, #fef2f8, #faf5ff);
       font-size: 12px;
-      color: #6b6674;
+      color: var(--text-muted);
       display: flex;
       align-items: center;
       gap: 8px;
@@ -188,9 +313,8 @@ APP_HTML = r"""<!DOCTYPE html>
     }
 
     .header {
-      background: rgba(255, 255, 255, 0.8);
-      backdrop-filter: blur(10px);
-      border-bottom: 4px solid #ffc1e3;
+      background: rgba(255, 255, 255, 0.85);
+      border-bottom: var(--border-pink);
       padding: 24px;
       display: flex;
       justify-content: space-between;
@@ -202,7 +326,7 @@ APP_HTML = r"""<!DOCTYPE html>
       margin: 0 0 12px 0;
       font-size: 28px;
       font-weight: 700;
-      color: #1f2937;
+      color: var(--text-strong);
       font-family: 'Rubik', sans-serif;
     }
 
@@ -258,7 +382,7 @@ APP_HTML = r"""<!DOCTYPE html>
       gap: 8px;
       transition: all 0.2s ease;
       font-family: 'Rubik', sans-serif;
-      box-shadow: 0 6px 16px rgba(0, 0, 0, 0.1);
+      box-shadow: var(--shadow-md);
     }
 
     .flashcard-btn {
@@ -267,7 +391,7 @@ APP_HTML = r"""<!DOCTYPE html>
     }
 
     .quiz-btn {
-      background: linear-gradient(135deg, #60a5fa, #a78bfa);
+      background: var(--gradient-blue);
       color: white;
     }
 
@@ -283,12 +407,17 @@ APP_HTML = r"""<!DOCTYPE html>
       display: flex;
       flex-direction: column;
       gap: 16px;
+      contain: layout;
     }
 
     .message {
       display: flex;
       gap: 12px;
       animation: slideIn 0.3s ease-out;
+      will-change: transform, opacity; /* released on animationend */
+      /* Skip layout/paint for messages scrolled out of view */
+      content-visibility: auto;
+      contain-intrinsic-size: auto 88px;
     }
 
     .message.user {
@@ -317,25 +446,31 @@ APP_HTML = r"""<!DOCTYPE html>
       font-weight: bold;
       flex-shrink: 0;
       transition: all 0.3s ease;
-      box-shadow: 0 6px 16px rgba(0, 0, 0, 0.1);
+      box-shadow: var(--shadow-md);
     }
 
-    .mascot.happy {
+    /* The face follows the container's data-mascot, so a mood change is one attribute write */
+    .messages[data-mascot="happy"] .mascot::before { content: '^_^'; }
+    .messages[data-mascot="thinking"] .mascot::before { content: '◯.◯'; }
+    .messages[data-mascot="excited"] .mascot::before { content: '★_★'; }
+
+    .messages[data-mascot="happy"] .mascot {
       background: linear-gradient(135deg, rgba(255, 107, 157, 0.3), rgba(255, 107, 157, 0.1));
       border: 3px solid #ff6b9d;
       color: #ff6b9d;
     }
 
-    .mascot.thinking {
+    .messages[data-mascot="thinking"] .mascot {
       background: linear-gradient(135deg, rgba(167, 139, 250, 0.3), rgba(167, 139, 250, 0.1));
       border: 3px solid #a78bfa;
       color: #a78bfa;
     }
 
-    .mascot.excited {
+    .messages[data-mascot="excited"] .mascot {
       background: linear-gradient(135deg, rgba(251, 191, 36, 0.3), rgba(251, 191, 36, 0.1));
       border: 3px solid #fbbf24;
       color: #fbbf24;
+      will-change: transform;
       animation: bounce 0.6s ease-in-out infinite;
     }
 
@@ -350,8 +485,9 @@ APP_HTML = r"""<!DOCTYPE html>
       border-radius: 24px;
       line-height: 1.5;
       word-wrap: break-word;
-      box-shadow: 0 8px 20px rgba(0, 0, 0, 0.1);
+      box-shadow: var(--shadow-lg);
       font-size: 14px;
+      contain: layout paint;
     }
 
     .message.bot .bubble {
@@ -383,96 +519,10 @@ APP_HTML = r"""<!DOCTYPE html>
       margin-top: 4px;
     }
 
-    /* ===== CITATIONS ===== */
-    .citations-container {
-      max-width: 70%;
-      margin-top: 12px;
-      padding: 8px 12px;
-      background: linear-gradient(135deg, rgba(199, 210, 254, 0.15), rgba(125, 211, 252, 0.15));
-      border-left: 4px solid #a78bfa;
-      border-radius: 12px;
-      font-size: 13px;
-      cursor: pointer;
-      transition: all 0.2s ease;
-    }
-
-    .citations-container:hover {
-      background: linear-gradient(135deg, rgba(199, 210, 254, 0.25), rgba(125, 211, 252, 0.25));
-    }
-
-    .citations-title {
-      font-weight: 700;
-      color: #6b6674;
-      display: flex;
-      align-items: center;
-      gap: 6px;
-      user-select: none;
-    }
-
-    .citations-toggle {
-      margin-left: auto;
-      font-size: 12px;
-      color: #a78bfa;
-      transition: transform 0.2s ease;
-    }
-
-    .citations-container.collapsed .citations-toggle {
-      transform: rotate(-90deg);
-    }
-
-    .citations-content {
-      margin-top: 8px;
-      max-height: 500px;
-      overflow: hidden;
-      transition: max-height 0.3s ease;
-    }
-
-    .citations-container.collapsed .citations-content {
-      max-height: 0;
-      margin-top: 0;
-    }
-
-    .citation-item {
-      padding: 10px 12px;
-      margin: 8px 0;
-      background: rgba(255, 255, 255, 0.6);
-      border-radius: 8px;
-      border-left: 3px solid #c7d2fe;
-      color: #4b5563;
-      line-height: 1.5;
-      font-size: 12px;
-    }
-
-    .citation-item strong {
-      display: block;
-      color: #a78bfa;
-      font-weight: 700;
-      margin-bottom: 4px;
-    }
-
-    .citation-score {
-      display: inline-block;
-      background: rgba(167, 139, 250, 0.2);
-      color: #a78bfa;
-      padding: 2px 6px;
-      border-radius: 4px;
-      font-size: 11px;
-      font-weight: 600;
-      margin-bottom: 6px;
-    }
-
-    .citation-text {
-      color: #6b6674;
-      font-size: 12px;
-      line-height: 1.4;
-      margin-top: 4px;
-    }
-
     /* ===== INPUT AREA ===== */
     .input-area {
-      background: rgba(255, 255, 255, 0.8);
-      backdrop-filter: blur(10px);
-      border-top: 4px solid #ffc1e3;
+      background: rgba(255, 255, 255, 0.85);
+      border-top: var(--border-pink);
       padding: 20px 24px;
       display: flex;
       gap: 12px;
@@ -489,7 +539,7 @@ APP_HTML = r"""<!DOCTYPE html>
       cursor: pointer;
       display: grid;
       place-items: center;
-      box-shadow: 0 6px 16px rgba(0, 0, 0, 0.1);
+      box-shadow: var(--shadow-md);
       transition: all 0.2s ease;
       flex-shrink: 0;
     }
@@ -560,7 +610,7 @@ APP_HTML = r"""<!DOCTYPE html>
       cursor: pointer;
       display: grid;
       place-items: center;
-      box-shadow: 0 6px 16px rgba(0, 0, 0, 0.1);
+      box-shadow: var(--shadow-md);
       transition: all 0.2s ease;
       flex-shrink: 0;
     }
@@ -583,7 +633,7 @@ APP_HTML = r"""<!DOCTYPE html>
     .provider-selector label {
       font-size: 12px;
       font-weight: 600;
-      color: #6b6674;
+      color: var(--text-muted);
     }
 
     .provider-selector select {
@@ -629,7 +679,7 @@ APP_HTML = r"""<!DOCTYPE html>
     .quiz-control label {
       font-size: 12px;
       font-weight: 600;
-      color: #6b6674;
+      color: var(--text-muted);
     }
 
     .flashcard-control select,
@@ -651,6 +701,7 @@ APP_HTML = r"""<!DOCTYPE html>
       inset: 0;
       background: rgba(0, 0, 0, 0.4);
       backdrop-filter: blur(4px);
+      will-change: backdrop-filter;
       z-index: 1000;
       align-items: center;
       justify-content: center;
@@ -661,6 +712,127 @@ APP_HTML = r"""<!DOCTYPE html>
       display: flex;
     }
 
+    @media (max-width: 768px) {
+      .container {
+        flex-direction: column;
+      }
+
+      .sidebar {
+        width: 100%;
+        border-right: none;
+        border-bottom: var(--border-pink);
+        max-height: 200px;
+      }
+
+      .main {
+        flex: 1;
+      }
+
+      .header-right {
+        flex-direction: column;
+      }
+
+      .message {
+        max-width: 90%;
+      }
+
+      .bubble {
+        max-width: 100%;
+      }
+    }
+"""
+
+
+# Rules for content shown after first paint (citations, modals, flashcards,
+# quiz), served from /ui/app.css and loaded without blocking render
+APP_CSS = r"""
+    /* ===== CITATIONS ===== */
+    .citations-container {
+      max-width: 70%;
+      margin-top: 12px;
+      padding: 8px 12px;
+      background: linear-gradient(135deg, rgba(199, 210, 254, 0.15), rgba(125, 211, 252, 0.15));
+      border-left: 4px solid #a78bfa;
+      border-radius: 12px;
+      font-size: 13px;
+      cursor: pointer;
+      transition: all 0.2s ease;
+    }
+
+    .citations-container:hover {
+      background: linear-gradient(135deg, rgba(199, 210, 254, 0.25), rgba(125, 211, 252, 0.25));
+    }
+
+    .citations-title {
+      font-weight: 700;
+      color: var(--text-muted);
+      display: flex;
+      align-items: center;
+      gap: 6px;
+      user-select: none;
+    }
+
+    .citations-toggle {
+      margin-left: auto;
+      font-size: 12px;
+      color: #a78bfa;
+      transition: transform 0.2s ease;
+    }
+
+    .citations-container.collapsed .citations-toggle {
+      transform: rotate(-90deg);
+    }
+
+    .citations-content {
+      margin-top: 8px;
+      max-height: 500px;
+      overflow: hidden;
+      transition: max-height 0.3s ease;
+    }
+
+    .citations-container.collapsed .citations-content {
+      max-height: 0;
+      margin-top: 0;
+    }
+
+    .citation-item {
+      padding: 10px 12px;
+      margin: 8px 0;
+      background: rgba(255, 255, 255, 0.6);
+      border-radius: 8px;
+      border-left: 3px solid #c7d2fe;
+      color: #4b5563;
+      line-height: 1.5;
+      font-size: 12px;
+      contain: layout paint;
+    }
+
+    .citation-item strong {
+      display: block;
+      color: #a78bfa;
+      font-weight: 700;
+      margin-bottom: 4px;
+    }
+
+    .citation-score {
+      display: inline-block;
+      background: rgba(167, 139, 250, 0.2);
+      color: #a78bfa;
+      padding: 2px 6px;
+      border-radius: 4px;
+      font-size: 11px;
+      font-weight: 600;
+      margin-bottom: 6px;
+    }
+
+    .citation-text {
+      color: var(--text-muted);
+      font-size: 12px;
+      line-height: 1.4;
+      margin-top: 4px;
+    }
+
+    /* ===== MODAL CONTENT ===== */
     .modal-content {
       background: linear-gradient(135deg, #fff5f9, #f0f9ff, #f0fff4);
       border-radius: 32px;
@@ -670,7 +842,7 @@ APP_HTML = r"""<!DOCTYPE html>
       max-height: 90vh;
       overflow-y: auto;
       box-shadow: 0 25px 70px rgba(0, 0, 0, 0.3);
-      border: 4px solid #ffc1e3;
+      border: var(--border-pink);
       position: relative;
     }
 
@@ -711,7 +883,7 @@ APP_HTML = r"""<!DOCTYPE html>
       display: grid;
       place-items: center;
       font-size: 40px;
-      box-shadow: 0 8px 20px rgba(0, 0, 0, 0.1);
+      box-shadow: var(--shadow-lg);
       flex-shrink: 0;
     }
 
@@ -720,7 +892,7 @@ APP_HTML = r"""<!DOCTYPE html>
     }
 
     .modal-icon.quiz {
-      background: linear-gradient(135deg, #60a5fa, #a78bfa);
+      background: var(--gradient-blue);
     }
 
     .modal-header h2 {
@@ -728,13 +900,13 @@ APP_HTML = r"""<!DOCTYPE html>
       font-size: 32px;
       font-weight: 800;
       font-family: 'Rubik', sans-serif;
-      color: #1f2937;
+      color: var(--text-strong);
     }
 
     .modal-header p {
       margin: 0;
       font-size: 15px;
-      color: #6b6674;
+      color: var(--text-muted);
       font-weight: 500;
     }
 
@@ -786,7 +958,7 @@ APP_HTML = r"""<!DOCTYPE html>
 
     .flashcard-back {
       background: linear-gradient(135deg, #e9d5ff, #fce7f3, #d1fae5);
-      color: #1f2937;
+      color: var(--text-strong);
       transform: rotateY(180deg);
     }
 
@@ -824,7 +996,7 @@ APP_HTML = r"""<!DOCTYPE html>
       right: 20px;
       width: 44px;
       height: 44px;
-      background: linear-gradient(135deg, #60a5fa, #a78bfa);
+      background: var(--gradient-blue);
       color: white;
       border-radius: 50%;
       display: flex;
@@ -832,13 +1004,13 @@ APP_HTML = r"""<!DOCTYPE html>
       justify-content: center;
       font-weight: 700;
       font-family: 'Rubik', sans-serif;
-      box-shadow: 0 6px 16px rgba(0, 0, 0, 0.1);
+      box-shadow: var(--shadow-md);
     }
 
     .question-text {
       font-size: 16px;
       font-weight: 600;
-      color: #1f2937;
+      color: var(--text-strong);
       margin-bottom: 16px;
       margin-top: 8px;
     }
@@ -863,7 +1035,7 @@ APP_HTML = r"""<!DOCTYPE html>
 
     .option-btn:hover:not(:disabled) {
       transform: translateY(-2px);
-      box-shadow: 0 6px 16px rgba(0, 0, 0, 0.1);
+      box-shadow: var(--shadow-md);
     }
 
     .option-btn.correct {
@@ -904,180 +1076,57 @@ APP_HTML = r"""<!DOCTYPE html>
       background: #ff6b9d;
       border-radius: 4px;
     }
+"""
 
-    @media (max-width: 768px) {
-      .container {
-        flex-direction: column;
-      }
-
-      .sidebar {
-        width: 100%;
-        border-right: none;
-        border-bottom: 4px solid #ffc1e3;
-        max-height: 200px;
-      }
+APP_CSS_ASSET = StaticAsset(
+    _minify_css(APP_CSS),
+    "text/css",
+    "no-cache",
+    versioned_cache_control="public, max-age=86400, immutable"
+)
 
-      .main {
-        flex: 1;
-      }
 
-      .header-right {
-        flex-direction: column;
-      }
+# Page behaviour, served from /ui/app.js so it is cached independently of the HTML
+APP_JS = r"""
+    const MODE_OPTIONS = [
+      { id: 'normal', label: 'Normal' },
+      { id: 'explain_simple', label: 'Explain Simply' },
+      { id: 'summarize', label: 'Summarize' },
+    ];
 
-      .message {
-        max-width: 90%;
-      }
-
-      .bubble {
-        max-width: 100%;
-      }
-    }
-  </style>
-</head>
-<body>
-  <div class="container">
-    <!-- SIDEBAR -->
-    <div class="sidebar">
-      <div class="sidebar-header">
-        <div class="brand">
-          <div class="brand-logo">📚</div>
-          <div class="brand-text">
-            <h1>Study Buddy</h1>
-            <p>Chat with your docs! 📚</p>
-          </div>
-        </div>
-        <button class="new-chat-btn">+ New Chat</button>
-      </div>
-
-      <div class="sidebar-conversations" id="conversations">
-        <!-- Conversations appear here -->
-      </div>
-
-      <div class="sidebar-footer">
-        ❤️ Made with love ✨
-      </div>
-    </div>
-
-    <!-- MAIN CHAT -->
-    <div class="main">
-      <div class="header">
-        <div class="header-left">
-          <h2 id="chatTitle">Welcome to Study Buddy</h2>
-          <div class="doc-pills" id="docPills"></div>
-        </div>
-        <div class="header-right">
-          <div class="provider-selector">
-            <label>Provider:</label>
-            <select id="providerSelect">
-              <option value="google">Google</option>
-              <option value="ollama">Ollama</option>
-            </select>
-            <button id="applyProvider">Apply</button>
-          </div>
-          <div class="flashcard-control">
-            <label for="flashcardCount">Cards:</label>
-            <select id="flashcardCountSelect">
-              <option value="4">4</option>
-              <option value="5">5</option>
-              <option value="10">10</option>
-              <option value="15">15</option>
-            </select>
-            <button class="mode-btn flashcard-btn" id="flashcardBtn">📚 Flashcards</button>
-          </div>
-          <div class="quiz-control">
-            <label for="quizCount">Questions:</label>
-            <select id="quizCountSelect">
-              <option value="3">3</option>
-              <option value="5">5</option>
-              <option value="10">10</option>
-            </select>
-            <button class="mode-btn quiz-btn" id="quizBtn">🧠 Quiz</button>
-          </div>
-        </div>
-      </div>
-
-      <div class="messages" id="messages">
-        <div class="message bot">
-          <div class="mascot happy">^_^</div>
-          <div>
-            <div class="bubble">Hi there! 🌸 I'm your Study Buddy! Upload a document and ask me anything, or I can create flashcards and quizzes for you!</div>
-            <div class="message-time">10:30 AM</div>
-          </div>
-        </div>
-      </div>
-
-      <div class="input-area">
-        <button class="upload-btn" id="uploadBtn" title="Upload PDF">
-          <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" aria-hidden="true">
-            <path d="M12 19V5" />
-            <path d="M5 12l7-7 7 7" />
-            <path d="M5 19h14" />
-          </svg>
-        </button>
-        <input type="file" id="pdfInput" accept=".pdf" style="display: none;" />
-        <div class="input-wrapper">
-          <textarea id="messageInput" placeholder="Ask me anything about your documents... ✨" rows="1"></textarea>
-          <span style="color: #ffc1e3;">✨</span>
-        </div>
-        <button class="mode-toggle" id="modeToggle" title="Switch response mode">Mode: Normal</button>
-        <button class="send-btn" id="sendBtn" title="Send">→</button>
-      </div>
-    </div>
-  </div>
-
-  <!-- FLASHCARD MODAL -->
-  <div class="modal" id="flashcardModal">
-    <div class="modal-content">
-      <button class="modal-close" id="closeFlashcard">✕</button>
-      <div class="modal-header">
-        <div class="modal-icon flashcard">📚</div>
-        <div>
-          <h2>Your Flashcards!</h2>
-          <p id="flashcardCount">Loading...</p>
-        </div>
-      </div>
-      <div class="flashcards-grid" id="flashcardsContainer"></div>
-    </div>
-  </div>
-
-  <!-- QUIZ MODAL -->
-  <div class="modal" id="quizModal">
-    <div class="modal-content">
-      <button class="modal-close" id="closeQuiz">✕</button>
-      <div class="modal-header">
-        <div class="modal-icon quiz">🧠</div>
-        <div>
-          <h2>Quiz Time!</h2>
-          <p id="quizCount">Loading...</p>
-        </div>
-      </div>
-      <div class="quiz-questions" id="quizContainer"></div>
-      <div class="modal-footer">⭐ Keep going! You're doing great! ✨</div>
-    </div>
-  </div>
-
-  <script>
-    const MODE_OPTIONS = [
-      { id: 'normal', label: 'Normal' },
-      { id: 'explain_simple', label: 'Explain Simply' },
-      { id: 'summarize', label: 'Summarize' },
-    ];
+    // Building a locale formatter is costly, so share one for all timestamps
+    const TIME_FMT = new Intl.DateTimeFormat([], { hour: '2-digit', minute: '2-digit' });
 
     const state = {
       currentChat: null,
       chats: {},
-      mascotState: 'happy',
+      chatOrder: [],  // chat ids, newest first
       flashcards: [],
       quizzes: [],
       currentModeIndex: 0,
     };
 
     // DOM Elements - declare globally
-    let uploadBtn, pdfInput, messageInput, sendBtn, modeToggle, messagesContainer;
-    let flashcardBtn, quizBtn, flashcardModal, quizModal;
-    let closeFlashcard, closeQuiz, docPills, chatTitle;
-    let conversationsContainer, providerSelect, applyProvider;
+    let pdfInput, messageInput, modeToggle, messagesContainer;
+    let flashcardModal, quizModal, docPills, chatTitle;
+    let conversationsContainer, providerSelect;
+    let messageTpl, flashcardTpl, quizQuestionTpl, quizOptionTpl;
+
+    // Button clicks, dispatched by data-action from one document listener
+    const ACTIONS = {
+      'new-chat': () => {
+        createNewChat();
+        messageInput.focus();
+      },
+      'upload': () => pdfInput.click(),
+      'send': sendMessage,
+      'toggle-mode': cycleMode,
+      'flashcards': () => generateFlashcards(),
+      'quiz': () => generateQuiz(),
+      'close-flashcards': () => flashcardModal.classList.remove('active'),
+      'close-quiz': () => quizModal.classList.remove('active'),
+      'apply-provider': switchProvider
+    };
 
     document.addEventListener('DOMContentLoaded', function() {
       // Initialize DOM elements after page loads
@@ -1089,9 +1138,13 @@ APP_HTML = r"""<!DOCTYPE html>
       // Render initial state
       renderConversations();
       loadProvider();
+      pruneAnswerCache();
       
       // Attach event listeners
-      uploadBtn.addEventListener('click', () => pdfInput.click());
+      document.addEventListener('click', (e) => {
+        const target = e.target.closest('[data-action]');
+        if (target) ACTIONS[target.dataset.action]?.();
+      });
       pdfInput.addEventListener('change', handleFileUpload);
       messageInput.addEventListener('input', autoResizeTextarea);
       messageInput.addEventListener('keypress', (e) => {
@@ -1100,16 +1153,29 @@ APP_HTML = r"""<!DOCTYPE html>
           sendMessage();
         }
       });
-      sendBtn.addEventListener('click', sendMessage);
-      modeToggle.addEventListener('click', cycleMode);
-      flashcardBtn.addEventListener('click', () => generateFlashcards());
-      quizBtn.addEventListener('click', () => generateQuiz());
-      closeFlashcard.addEventListener('click', () => flashcardModal.classList.remove('active'));
-      closeQuiz.addEventListener('click', () => quizModal.classList.remove('active'));
-      applyProvider.addEventListener('click', switchProvider);
-      document.querySelector('.new-chat-btn').addEventListener('click', () => {
-        createNewChat();
-        messageInput.focus();
+      conversationsContainer.addEventListener('click', (e) => {
+        const item = e.target.closest('.conv-item');
+        if (item) switchConversation(item.dataset.chatId);
+      });
+      messagesContainer.addEventListener('click', (e) => {
+        const citations = e.target.closest('.citations-container');
+        if (citations) citations.classList.toggle('collapsed');
+      });
+      flashcardModal.addEventListener('click', (e) => {
+        const card = e.target.closest('.flashcard');
+        if (card) card.classList.toggle('flipped');
+      });
+      quizModal.addEventListener('click', (e) => {
+        const option = e.target.closest('.option-btn');
+        if (option) handleQuizAnswer(option);
+      });
+      messagesContainer.addEventListener('animationend', (e) => {
+        // Free the slide-in compositor layer once the message has settled
+        if (e.target.classList.contains('message')) e.target.style.willChange = 'auto';
+      });
+      docPills.addEventListener('click', (e) => {
+        const close = e.target.closest('.doc-pill-close');
+        if (close) removeDoc(close.dataset.docId);
       });
 
       // initial mode label
@@ -1120,18 +1186,20 @@ APP_HTML = r"""<!DOCTYPE html>
     function createNewChat() {
       const chatId = Date.now().toString();
       const now = new Date();
-      const timeStr = now.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
+      const timeStr = TIME_FMT.format(now);
       
       state.chats[chatId] = {
         id: chatId,
-        title: `Chat ${Object.keys(state.chats).length + 1}`,
+        title: `Chat ${state.chatOrder.length + 1}`,
         messages: [
           { sender: 'bot', text: 'Hi there! 🌸 I\'m your Study Buddy! Upload a document and ask me anything, or I can create flashcards and quizzes for you!', time: timeStr, type: 'normal' }
         ],
         uploadedDocs: [],
         docId: null,
         createdAt: now,
+        createdAtStr: timeStr,
       };
+      state.chatOrder.unshift(chatId);
       
       state.currentChat = chatId;
       renderConversations();
@@ -1141,37 +1209,39 @@ APP_HTML = r"""<!DOCTYPE html>
 
     // Initialize DOM elements after page loads
     function initializeDOMElements() {
-      uploadBtn = document.getElementById('uploadBtn');
-      pdfInput = document.getElementById('pdfInput');
-      messageInput = document.getElementById('messageInput');
-      sendBtn = document.getElementById('sendBtn');
-      modeToggle = document.getElementById('modeToggle');
-      messagesContainer = document.getElementById('messages');
-      flashcardBtn = document.getElementById('flashcardBtn');
-      quizBtn = document.getElementById('quizBtn');
-      flashcardModal = document.getElementById('flashcardModal');
-      quizModal = document.getElementById('quizModal');
-      closeFlashcard = document.getElementById('closeFlashcard');
-      closeQuiz = document.getElementById('closeQuiz');
-      docPills = document.getElementById('docPills');
-      chatTitle = document.getElementById('chatTitle');
-      conversationsContainer = document.getElementById('conversations');
-      providerSelect = document.getElementById('providerSelect');
-      applyProvider = document.getElementById('applyProvider');
+      // Collect every element with an id in one DOM walk
+      const els = {};
+      for (const el of document.querySelectorAll('[id]')) els[el.id] = el;
+
+      ({
+        pdfInput, messageInput, modeToggle,
+        messages: messagesContainer, flashcardModal, quizModal, docPills, chatTitle,
+        conversations: conversationsContainer, providerSelect,
+      } = els);
+
+      messageTpl = els.messageTpl.content.firstElementChild;
+      flashcardTpl = els.flashcardTpl.content.firstElementChild;
+      quizQuestionTpl = els.quizQuestionTpl.content.firstElementChild;
+      quizOptionTpl = els.quizOptionTpl.content.firstElementChild;
     }
 
     async function handleFileUpload(e) {
       const file = e.target.files[0];
       if (!file) return;
 
-      const formData = new FormData();
-      formData.append('file', file);
-
       try {
-        const res = await fetch('/rag/ingest/pdf', { method: 'POST', body: formData });
+        // Send the File itself so the browser streams it from disk
+        const res = await fetch('/rag/ingest/pdf', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/pdf', 'X-Filename': encodeURIComponent(file.name) },
+          body: file,
+        });
         const data = await res.json();
         if (!res.ok) throw new Error(data.detail);
         
+        // A re-upload keeps its doc_id, so answers about the previous version are stale
+        purgeCachedAnswers(data.doc_id);
+
         const chat = state.chats[state.currentChat];
         chat.docId = data.doc_id;
         chat.uploadedDocs.push({ id: data.doc_id, name: file.name });
@@ -1185,9 +1255,16 @@ APP_HTML = r"""<!DOCTYPE html>
       pdfInput.value = '';
     }
 
+    // Coalesce input events into one resize per animation frame
+    let resizeFrame = 0;
+
     function autoResizeTextarea() {
-      messageInput.style.height = 'auto';
-      messageInput.style.height = Math.min(messageInput.scrollHeight, 120) + 'px';
+      if (resizeFrame) return;
+      resizeFrame = requestAnimationFrame(() => {
+        resizeFrame = 0;
+        messageInput.style.height = 'auto';
+        messageInput.style.height = Math.min(messageInput.scrollHeight, 120) + 'px';
+      });
     }
 
     function updateModeButton() {
@@ -1228,6 +1305,22 @@ APP_HTML = r"""<!DOCTYPE html>
           inputText = `${text} (Explain simply)`;
         }
 
+        // Repeated questions about the same document are answered from the cache
+        const cacheKey = agentCacheKey(modeToSend, chat.docId, inputText);
+        const cached = getCachedAnswer(cacheKey);
+        if (cached) {
+          addBotMessage(cached.message, 'normal', cached.sources);
+          return;
+        }
+
+        if (modeToSend === 'explain') {
+          const answer = await streamExplanation(inputText, chat.docId || null);
+          if (answer.complete && answer.message) {
+            cacheAnswer(cacheKey, { message: answer.message, sources: answer.sources });
+          }
+          return;
+        }
+
         const res = await fetch('/agent', {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
@@ -1243,6 +1336,10 @@ APP_HTML = r"""<!DOCTYPE html>
 
         if (data.message) {
           addBotMessage(data.message, 'normal', data.sources || []);
+          // A warning means the message reports a failure rather than an answer
+          if (!data.warning) {
+            cacheAnswer(cacheKey, { message: data.message, sources: data.sources || [] });
+          }
         }
       } catch (err) {
         addBotMessage(`Error: ${err.message}`, 'error', []);
@@ -1251,6 +1348,144 @@ APP_HTML = r"""<!DOCTYPE html>
       }
     }
 
+    // Read /agent/stream events and grow a bot message as the answer arrives
+    async function streamExplanation(input, docId) {
+      const res = await fetch('/agent/stream', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ mode: 'explain', input, doc_id: docId }),
+      });
+      if (!res.ok) {
+        const data = await res.json();
+        throw new Error(data.detail);
+      }
+
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let sources = [];
+      let msg = null;
+      let bubble = null;
+      let complete = false;
+
+      const showText = (text) => {
+        if (!msg) {
+          addBotMessage(text, 'normal', sources);
+          const chat = state.chats[state.currentChat];
+          msg = chat.messages[chat.messages.length - 1];
+          bubble = messagesContainer.lastElementChild.querySelector('.bubble');
+          return;
+        }
+        msg.text = text;
+        bubble.textContent = text;
+        messagesContainer.scrollTop = messagesContainer.scrollHeight;
+      };
+
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events end with a blank line; keep any partial one for the next read
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const raw of events) {
+          if (!raw.startsWith('data: ')) continue;
+          const event = JSON.parse(raw.slice(6));
+          if (event.type === 'start') {
+            sources = event.sources || [];
+          } else if (event.type === 'delta') {
+            showText((msg ? msg.text : '') + event.text);
+          } else if (event.type === 'done') {
+            if (event.message) showText(event.message);
+            complete = true;
+          } else if (event.type === 'error') {
+            throw new Error(event.message);
+          }
+        }
+      }
+
+      // complete is false when the stream ended without a done event
+      return { message: msg ? msg.text : '', sources, complete };
+    }
+
+    // Answers kept in localStorage, keyed by provider, mode, document and question
+    const AGENT_CACHE_TTL_MS = 6 * 60 * 60 * 1000;
+    const AGENT_CACHE_MAX_ENTRIES = 200;
+
+    function agentCacheKey(mode, docId, input) {
+      const provider = sessionStorage.getItem('llmProvider') || '';
+      return `agent:${provider}|${mode}|${docId || ''}|${input.trim().toLowerCase()}`;
+    }
+
+    function getCachedAnswer(key) {
+      try {
+        const hit = JSON.parse(localStorage.getItem(key));
+        if (hit && Date.now() - hit.ts < AGENT_CACHE_TTL_MS) return hit.data;
+        if (hit) localStorage.removeItem(key);
+      } catch {
+        // Unreadable entry or storage disabled, treat as a miss
+      }
+      return null;
+    }
+
+    function cacheAnswer(key, data) {
+      const entry = JSON.stringify({ ts: Date.now(), data });
+      try {
+        localStorage.setItem(key, entry);
+      } catch {
+        // Quota exceeded: make room by dropping the older half and retry once
+        pruneAnswerCache(AGENT_CACHE_MAX_ENTRIES / 2);
+        try {
+          localStorage.setItem(key, entry);
+        } catch {
+          // Still full or storage disabled, skip caching
+        }
+      }
+    }
+
+    // Drop every cached answer about a document
+    function purgeCachedAnswers(docId) {
+      try {
+        const stale = [];
+        for (let i = 0; i < localStorage.length; i++) {
+          const key = localStorage.key(i);
+          if (key.startsWith('agent:') && key.split('|')[2] === docId) stale.push(key);
+        }
+        stale.forEach((key) => localStorage.removeItem(key));
+      } catch {
+        // Storage disabled, nothing cached
+      }
+    }
+
+    // Drop expired answers, and the oldest ones beyond maxEntries
+    function pruneAnswerCache(maxEntries = AGENT_CACHE_MAX_ENTRIES) {
+      try {
+        const entries = [];
+        for (let i = 0; i < localStorage.length; i++) {
+          const key = localStorage.key(i);
+          if (!key.startsWith('agent:')) continue;
+          let ts = 0;
+          try {
+            ts = JSON.parse(localStorage.getItem(key)).ts || 0;
+          } catch {
+            // Unreadable entry, prune it as expired
+          }
+          entries.push({ key, ts });
+        }
+
+        const now = Date.now();
+        entries.sort((a, b) => b.ts - a.ts);
+        entries.forEach((entry, i) => {
+          if (i >= maxEntries || now - entry.ts >= AGENT_CACHE_TTL_MS) {
+            localStorage.removeItem(entry.key);
+          }
+        });
+      } catch {
+        // Storage disabled, nothing to prune
+      }
+    }
+
     async function generateFlashcards() {
       const chat = state.chats[state.currentChat];
       if (!chat.docId) {
@@ -1326,62 +1561,50 @@ APP_HTML = r"""<!DOCTYPE html>
       const container = document.getElementById('flashcardsContainer');
       document.getElementById('flashcardCount').textContent = `${state.flashcards.length} cards`;
 
-      container.innerHTML = state.flashcards
-        .map(
-          (fc, idx) => `
-        <div class="flashcard" data-idx="${idx}">
-          <div class="flashcard-inner">
-            <div class="flashcard-face flashcard-front">
-              <div class="flashcard-label">Card ${idx + 1}</div>
-              <p style="font-weight: 600; font-size: 16px;">${escapeHtml(fc.question)}</p>
-            </div>
-            <div class="flashcard-face flashcard-back">
-              <div>
-                <p style="font-weight: 600; margin: 0 0 12px 0;">Answer</p>
-                <p>${escapeHtml(fc.answer)}</p>
-                ${fc.mnemonic ? `<p style="font-size: 12px; color: #6b6674; margin-top: 8px;">Tip: ${escapeHtml(fc.mnemonic)}</p>` : ''}
-              </div>
-            </div>
-          </div>
-        </div>
-      `
-        )
-        .join('');
+      const frag = document.createDocumentFragment();
+      state.flashcards.forEach((fc, idx) => frag.appendChild(buildFlashcardNode(fc, idx)));
+      container.replaceChildren(frag);
+    }
 
-      document.querySelectorAll('.flashcard').forEach((card) => {
-        card.addEventListener('click', () => card.classList.toggle('flipped'));
-      });
+    function buildFlashcardNode(fc, idx) {
+      const card = flashcardTpl.cloneNode(true);
+      card.dataset.idx = idx;
+      field(card, 'label').textContent = `Card ${idx + 1}`;
+      field(card, 'question').textContent = fc.question;
+      field(card, 'answer').textContent = fc.answer;
+      if (fc.mnemonic) {
+        field(card, 'back').appendChild(el('p', '', `Tip: ${fc.mnemonic}`, 'font-size: 12px; color: var(--text-muted); margin-top: 8px;'));
+      }
+      return card;
     }
 
     function renderQuiz() {
       const container = document.getElementById('quizContainer');
       document.getElementById('quizCount').textContent = `${state.quizzes.length} questions`;
 
-      container.innerHTML = state.quizzes
-        .map(
-          (q, idx) => `
-        <div class="quiz-question" data-q="${idx}">
-          <div class="question-num">${idx + 1}</div>
-          <div class="question-text">${escapeHtml(q.question)}</div>
-          <div class="options">
-            ${q.options
-              .map(
-                (opt, oIdx) => `
-              <button class="option-btn" data-correct="${opt.is_correct}" onclick="handleQuizAnswer(this, ${q.id || idx})">
-                <span style="font-weight: 700; font-family: Rubik; margin-right: 8px;">${escapeHtml(opt.label)}</span>
-                ${escapeHtml(opt.text)}
-              </button>
-            `
-              )
-              .join('')}
-          </div>
-        </div>
-      `
-        )
-        .join('');
+      const frag = document.createDocumentFragment();
+      state.quizzes.forEach((q, idx) => frag.appendChild(buildQuizNode(q, idx)));
+      container.replaceChildren(frag);
     }
 
-    window.handleQuizAnswer = function (btn, qIdx) {
+    function buildQuizNode(q, idx) {
+      const question = quizQuestionTpl.cloneNode(true);
+      question.dataset.q = idx;
+      field(question, 'num').textContent = String(idx + 1);
+      field(question, 'question').textContent = q.question;
+
+      const options = field(question, 'options');
+      for (const opt of q.options) {
+        const btn = quizOptionTpl.cloneNode(true);
+        btn.dataset.correct = opt.is_correct;
+        field(btn, 'label').textContent = opt.label;
+        btn.append(opt.text);
+        options.appendChild(btn);
+      }
+      return question;
+    }
+
+    function handleQuizAnswer(btn) {
       if (btn.parentElement.querySelector('.selected, .correct, .wrong')) return;
 
       const isCorrect = btn.dataset.correct === 'true' || btn.dataset.correct === 'True';
@@ -1391,20 +1614,19 @@ APP_HTML = r"""<!DOCTYPE html>
         setMascot('excited');
         setTimeout(() => setMascot('happy'), 1500);
       }
-    };
+    }
 
     function renderDocPills() {
       const chat = state.chats[state.currentChat];
-      docPills.innerHTML = chat.uploadedDocs
-        .map(
-          (doc) => `
-        <div class="doc-pill" style="background-color: #ffc1e3; color: #7c2c4f;">
-          <span>📄 ${doc.name}</span>
-          <span class="doc-pill-close" onclick="removeDoc('${doc.id}')">✕</span>
-        </div>
-      `
-        )
-        .join('');
+      const frag = document.createDocumentFragment();
+      for (const doc of chat.uploadedDocs) {
+        const pill = el('div', 'doc-pill', '', 'background-color: #ffc1e3; color: #7c2c4f;');
+        const close = el('span', 'doc-pill-close', '✕');
+        close.dataset.docId = doc.id;
+        pill.append(el('span', '', `📄 ${doc.name}`), close);
+        frag.appendChild(pill);
+      }
+      docPills.replaceChildren(frag);
     }
 
     function removeDoc(docId) {
@@ -1416,28 +1638,50 @@ APP_HTML = r"""<!DOCTYPE html>
       renderDocPills();
     }
 
-    // Expose globally for onclick handlers
-    window.removeDoc = removeDoc;
+    // Conversation list nodes are kept per chat and updated in place
+    const convNodes = new Map();
 
     function renderConversations() {
-      conversationsContainer.innerHTML = Object.values(state.chats)
-        .sort((a, b) => b.createdAt - a.createdAt)
-        .map(
-          (chat) => {
-            const lastMsg = chat.messages.length > 0 
-              ? chat.messages[chat.messages.length - 1].text.substring(0, 40) + '...'
-              : 'No messages yet';
-            const timeStr = chat.createdAt.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
-            return `
-        <div class="conv-item ${chat.id === state.currentChat ? 'active' : ''}" onclick="switchConversation('${chat.id}')">
-          <div class="conv-title">${chat.title}</div>
-          <div class="conv-preview">${escapeHtml(lastMsg)}</div>
-          <div class="conv-time">${timeStr}</div>
-        </div>
-      `;
-          }
-        )
-        .join('');
+      const seen = new Set();
+
+      state.chatOrder.forEach((chatId, idx) => {
+        const chat = state.chats[chatId];
+        seen.add(chat.id);
+        let node = convNodes.get(chat.id);
+        if (!node) {
+          node = document.createElement('div');
+          node.className = 'conv-item';
+          node.dataset.chatId = chat.id;
+          node.innerHTML = '<div class="conv-title"></div><div class="conv-preview"></div><div class="conv-time"></div>';
+          node.children[2].textContent = chat.createdAtStr;  // fixed at creation
+          convNodes.set(chat.id, node);
+        }
+
+        setText(node.children[0], chat.title);
+        setText(node.children[1], convPreview(chat));
+        node.classList.toggle('active', chat.id === state.currentChat);
+
+        // Only move nodes that are out of order
+        const current = conversationsContainer.children[idx];
+        if (current !== node) conversationsContainer.insertBefore(node, current || null);
+      });
+
+      for (const [id, node] of convNodes) {
+        if (!seen.has(id)) {
+          node.remove();
+          convNodes.delete(id);
+        }
+      }
+    }
+
+    function convPreview(chat) {
+      return chat.messages.length > 0 
+        ? chat.messages[chat.messages.length - 1].text.substring(0, 40) + '...'
+        : 'No messages yet';
+    }
+
+    function setText(el, text) {
+      if (el.textContent !== text) el.textContent = text;
     }
 
     function switchConversation(chatId) {
@@ -1449,108 +1693,131 @@ APP_HTML = r"""<!DOCTYPE html>
       renderDocPills();
     }
 
-    // Expose globally for onclick handlers
-    window.switchConversation = switchConversation;
-
     function addUserMessage(text) {
-      const time = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
+      const time = TIME_FMT.format(new Date());
       const chat = state.chats[state.currentChat];
       chat.messages.push({ sender: 'user', text, time });
       renderMessages();
-      renderConversations();
+      // Order and active state are unchanged, only the preview line moves on
+      const convNode = convNodes.get(chat.id);
+      if (convNode) setText(convNode.children[1], convPreview(chat));
     }
 
     function addBotMessage(text, type = 'normal', citations = []) {
-      const time = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
+      const time = TIME_FMT.format(new Date());
       const chat = state.chats[state.currentChat];
       chat.messages.push({ sender: 'bot', text, time, type, citations });
       renderMessages();
     }
 
+    // Which chat is on screen and how many of its messages are already rendered
+    let renderedChatId = null;
+    let renderedCount = 0;
+
     function renderMessages() {
       const chat = state.chats[state.currentChat];
-      messagesContainer.innerHTML = chat.messages
-        .map(
-          (msg) => {
-            const citationsHtml = msg.citations && msg.citations.length > 0 
-              ? `
-                <div class="citations-container collapsed" onclick="toggleCitations(event)">
-                  <div class="citations-title">
-                    <span>📚 Sources (${msg.citations.length})</span>
-                    <span class="citations-toggle">▼</span>
-                  </div>
-                  <div class="citations-content">
-                    ${msg.citations.map((c, idx) => {
-                      // Handle both object citations and string citations
-                      if (typeof c === 'string') {
-                        return `<div class="citation-item">${escapeHtml(c)}</div>`;
-                      } else if (typeof c === 'object' && c !== null) {
-                        const chunkId = c.chunk_id || `chunk_${idx}`;
-                        const score = c.score ? (typeof c.score === 'number' ? c.score.toFixed(3) : c.score) : 'N/A';
-                        const text = c.text ? escapeHtml(c.text) : 'No text available';
-                        return `
-                          <div class="citation-item">
-                            <strong>${escapeHtml(chunkId)}</strong>
-                            <div class="citation-score">Relevance: ${score}</div>
-                            <div class="citation-text">${text}</div>
-                          </div>
-                        `;
-                      }
-                      return '';
-                    }).join('')}
-                  </div>
-                </div>
-              `
-              : '';
-            
-            return `
-        <div class="message ${msg.sender}">
-          ${
-            msg.sender === 'bot'
-              ? `
-            <div class="mascot ${state.mascotState}">
-              ${state.mascotState === 'thinking' ? '◯.◯' : state.mascotState === 'excited' ? '★_★' : '^_^'}
-            </div>
-          `
-              : ''
-          }
-          <div>
-            <div class="bubble" style="${msg.type === 'error' ? 'background: #fee2e2; border-color: #f87171; color: #7f1d1d;' : ''}">${escapeHtml(msg.text)}</div>
-            ${citationsHtml}
-            <div class="message-time">${msg.time}</div>
-          </div>
-        </div>
-      `;
-          }
-        )
-        .join('');
+      const frag = document.createDocumentFragment();
+
+      if (renderedChatId !== chat.id || renderedCount > chat.messages.length) {
+        // Switched chats, reattach that chat's nodes (building any not seen yet)
+        for (const msg of chat.messages) frag.appendChild(messageNode(msg));
+        messagesContainer.replaceChildren(frag);
+      } else {
+        // Same chat, only append what was pushed since the last render
+        for (const msg of chat.messages.slice(renderedCount)) frag.appendChild(messageNode(msg));
+        messagesContainer.appendChild(frag);
+      }
+
+      renderedChatId = chat.id;
+      renderedCount = chat.messages.length;
       messagesContainer.scrollTop = messagesContainer.scrollHeight;
     }
 
-    function setMascot(newState) {
-      state.mascotState = newState;
-      renderMessages();
+    // Messages never change once rendered (streamed text is written into the same node),
+    // so each one is built once, citations included, and reused across chat switches
+    const messageNodes = new WeakMap();
+
+    function messageNode(msg) {
+      let node = messageNodes.get(msg);
+      if (!node) {
+        node = buildMessageNode(msg);
+        messageNodes.set(msg, node);
+      }
+      return node;
+    }
+
+    // Look up a data-field slot inside a cloned template
+    function field(node, name) {
+      return node.querySelector(`[data-field="${name}"]`);
     }
 
-    function toggleCitations(event) {
-      const container = event.currentTarget;
-      container.classList.toggle('collapsed');
-      event.stopPropagation();
+    function buildMessageNode(msg) {
+      const node = messageTpl.cloneNode(true);
+      node.classList.add(msg.sender);
+      if (msg.sender !== 'bot') node.querySelector('.mascot').remove();
+
+      const bubble = field(node, 'text');
+      bubble.textContent = msg.text;
+      if (msg.type === 'error') {
+        bubble.style.cssText = 'background: #fee2e2; border-color: #f87171; color: #7f1d1d;';
+      }
+      const time = field(node, 'time');
+      time.textContent = msg.time;
+      if (msg.citations && msg.citations.length > 0) {
+        time.before(buildCitationsNode(msg.citations));
+      }
+      return node;
+    }
+
+    function buildCitationsNode(citations) {
+      const container = el('div', 'citations-container collapsed');
+
+      const title = el('div', 'citations-title');
+      title.append(el('span', '', `📚 Sources (${citations.length})`), el('span', 'citations-toggle', '▼'));
+
+      const content = el('div', 'citations-content');
+      citations.forEach((c, idx) => {
+        // Handle both object citations and string citations
+        if (typeof c === 'string') {
+          content.appendChild(el('div', 'citation-item', c));
+        } else if (typeof c === 'object' && c !== null) {
+          const score = c.score ? (typeof c.score === 'number' ? c.score.toFixed(3) : c.score) : 'N/A';
+          const item = el('div', 'citation-item');
+          item.append(
+            el('strong', '', c.chunk_id || `chunk_${idx}`),
+            el('div', 'citation-score', `Relevance: ${score}`),
+            el('div', 'citation-text', c.text || 'No text available')
+          );
+          content.appendChild(item);
+        }
+      });
+
+      container.append(title, content);
+      return container;
     }
 
-    // Expose globally
-    window.toggleCitations = toggleCitations;
+    function setMascot(newState) {
+      messagesContainer.dataset.mascot = newState;
+    }
 
-    function escapeHtml(text) {
-      const map = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
-      return text.replace(/[&<>"']/g, (m) => map[m]);
+    // Create an element with optional class, text and inline style
+    function el(tag, className = '', text, style) {
+      const node = document.createElement(tag);
+      if (className) node.className = className;
+      if (text !== undefined) node.textContent = text;
+      if (style) node.style.cssText = style;
+      return node;
     }
 
     async function loadProvider() {
+      // Show the last known provider right away, then revalidate against the server
+      const cached = sessionStorage.getItem('llmProvider');
+      if (cached) providerSelect.value = cached;
       try {
         const res = await fetch('/providers');
         const data = await res.json();
         providerSelect.value = data.llm_provider;
+        sessionStorage.setItem('llmProvider', data.llm_provider);
       } catch {
         console.error('Failed to load provider');
       }
@@ -1569,25 +1836,248 @@ APP_HTML = r"""<!DOCTYPE html>
         });
         const data = await res.json();
         if (!res.ok) throw new Error(data.detail);
+        sessionStorage.setItem('llmProvider', data.llm_provider);
         addBotMessage(`✓ Switched to ${provider} provider!`);
       } catch (err) {
         addBotMessage(`Provider switch failed: ${err.message}`, 'error');
         loadProvider();
       }
     }
-  </script>
+"""
+
+APP_JS_ASSET = StaticAsset(
+    APP_JS,
+    "text/javascript",
+    "no-cache",
+    versioned_cache_control="public, max-age=86400, immutable"
+)
+
+FONTS_CSS_URL = (
+    "https://fonts.googleapis.com/css2?"
+    "family=Nunito:wght@400;500;600;700&family=Rubik:wght@500;600;700;800&display=swap"
+)
+
+
+APP_HTML = r"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+  <title>Study Buddy - Chat with Your Docs</title>
+  <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin />
+  <link rel="preload" href='""" + FONTS_CSS_URL + r"""' as="style" onload="this.rel='stylesheet'" />
+  <noscript><link rel="stylesheet" href='""" + FONTS_CSS_URL + r"""' /></noscript>
+  <style>""" + _minify_css(CRITICAL_CSS) + r"""</style>
+  <link rel="preload" href="/ui/app.css?v=""" + APP_CSS_ASSET.version + r"""" as="style" onload="this.rel='stylesheet'" />
+  <noscript><link rel="stylesheet" href="/ui/app.css?v=""" + APP_CSS_ASSET.version + r"""" /></noscript>
+</head>
+<body>
+  <div class="container">
+    <!-- SIDEBAR -->
+    <div class="sidebar">
+      <div class="sidebar-header">
+        <div class="brand">
+          <div class="brand-logo">📚</div>
+          <div class="brand-text">
+            <h1>Study Buddy</h1>
+            <p>Chat with your docs! 📚</p>
+          </div>
+        </div>
+        <button class="new-chat-btn" data-action="new-chat">+ New Chat</button>
+      </div>
+
+      <div class="sidebar-conversations" id="conversations">
+        <!-- Conversations appear here -->
+      </div>
+
+      <div class="sidebar-footer">
+        ❤️ Made with love ✨
+      </div>
+    </div>
+
+    <!-- MAIN CHAT -->
+    <div class="main">
+      <div class="header">
+        <div class="header-left">
+          <h2 id="chatTitle">Welcome to Study Buddy</h2>
+          <div class="doc-pills" id="docPills"></div>
+        </div>
+        <div class="header-right">
+          <div class="provider-selector">
+            <label>Provider:</label>
+            <select id="providerSelect">
+              <option value="google">Google</option>
+              <option value="ollama">Ollama</option>
+            </select>
+            <button id="applyProvider" data-action="apply-provider">Apply</button>
+          </div>
+          <div class="flashcard-control">
+            <label for="flashcardCount">Cards:</label>
+            <select id="flashcardCountSelect">
+              <option value="4">4</option>
+              <option value="5">5</option>
+              <option value="10">10</option>
+              <option value="15">15</option>
+            </select>
+            <button class="mode-btn flashcard-btn" id="flashcardBtn" data-action="flashcards">📚 Flashcards</button>
+          </div>
+          <div class="quiz-control">
+            <label for="quizCount">Questions:</label>
+            <select id="quizCountSelect">
+              <option value="3">3</option>
+              <option value="5">5</option>
+              <option value="10">10</option>
+            </select>
+            <button class="mode-btn quiz-btn" id="quizBtn" data-action="quiz">🧠 Quiz</button>
+          </div>
+        </div>
+      </div>
+
+      <div class="messages" id="messages" data-mascot="happy">
+        <div class="message bot">
+          <div class="mascot"></div>
+          <div>
+            <div class="bubble">Hi there! 🌸 I'm your Study Buddy! Upload a document and ask me anything, or I can create flashcards and quizzes for you!</div>
+            <div class="message-time">10:30 AM</div>
+          </div>
+        </div>
+      </div>
+
+      <div class="input-area">
+        <button class="upload-btn" id="uploadBtn" title="Upload PDF" data-action="upload">
+          <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" aria-hidden="true">
+            <path d="M12 19V5" />
+            <path d="M5 12l7-7 7 7" />
+            <path d="M5 19h14" />
+          </svg>
+        </button>
+        <input type="file" id="pdfInput" accept=".pdf" style="display: none;" />
+        <div class="input-wrapper">
+          <textarea id="messageInput" placeholder="Ask me anything about your documents... ✨" rows="1"></textarea>
+          <span style="color: #ffc1e3;">✨</span>
+        </div>
+        <button class="mode-toggle" id="modeToggle" title="Switch response mode" data-action="toggle-mode">Mode: Normal</button>
+        <button class="send-btn" id="sendBtn" title="Send" data-action="send">→</button>
+      </div>
+    </div>
+  </div>
+
+  <!-- FLASHCARD MODAL -->
+  <div class="modal" id="flashcardModal">
+    <div class="modal-content">
+      <button class="modal-close" id="closeFlashcard" data-action="close-flashcards">✕</button>
+      <div class="modal-header">
+        <div class="modal-icon flashcard">📚</div>
+        <div>
+          <h2>Your Flashcards!</h2>
+          <p id="flashcardCount">Loading...</p>
+        </div>
+      </div>
+      <div class="flashcards-grid" id="flashcardsContainer"></div>
+    </div>
+  </div>
+
+  <!-- QUIZ MODAL -->
+  <div class="modal" id="quizModal">
+    <div class="modal-content">
+      <button class="modal-close" id="closeQuiz" data-action="close-quiz">✕</button>
+      <div class="modal-header">
+        <div class="modal-icon quiz">🧠</div>
+        <div>
+          <h2>Quiz Time!</h2>
+          <p id="quizCount">Loading...</p>
+        </div>
+      </div>
+      <div class="quiz-questions" id="quizContainer"></div>
+      <div class="modal-footer">⭐ Keep going! You're doing great! ✨</div>
+    </div>
+  </div>
+
+  <!-- Node shapes the script clones and fills in -->
+  <template id="messageTpl">
+    <div class="message">
+      <div class="mascot"></div>
+      <div>
+        <div class="bubble" data-field="text"></div>
+        <div class="message-time" data-field="time"></div>
+      </div>
+    </div>
+  </template>
+
+  <template id="flashcardTpl">
+    <div class="flashcard">
+      <div class="flashcard-inner">
+        <div class="flashcard-face flashcard-front">
+          <div class="flashcard-label" data-field="label"></div>
+          <p style="font-weight: 600; font-size: 16px;" data-field="question"></p>
+        </div>
+        <div class="flashcard-face flashcard-back">
+          <div data-field="back">
+            <p style="font-weight: 600; margin: 0 0 12px 0;">Answer</p>
+            <p data-field="answer"></p>
+          </div>
+        </div>
+      </div>
+    </div>
+  </template>
+
+  <template id="quizQuestionTpl">
+    <div class="quiz-question">
+      <div class="question-num" data-field="num"></div>
+      <div class="question-text" data-field="question"></div>
+      <div class="options" data-field="options"></div>
+    </div>
+  </template>
+
+  <template id="quizOptionTpl">
+    <button class="option-btn"><span style="font-weight: 700; font-family: Rubik; margin-right: 8px;" data-field="label"></span></button>
+  </template>
+
+  <script src="/ui/app.js?v=""" + APP_JS_ASSET.version + r"""" defer></script>
 </body>
 </html>
 """
 
 
+# Lets the browser start fetching the subresources before it parses the page
+APP_HTML_LINK_HEADER = ", ".join([
+    f"</ui/app.css?v={APP_CSS_ASSET.version}>; rel=preload; as=style",
+    f"</ui/app.js?v={APP_JS_ASSET.version}>; rel=preload; as=script",
+    f"<{FONTS_CSS_URL}>; rel=preload; as=style",
+])
+
+APP_HTML_ASSET = StaticAsset(
+    _minify_html(APP_HTML),
+    "text/html",
+    "public, max-age=3600, must-revalidate",
+    extra_headers={"Link": APP_HTML_LINK_HEADER}
+)
+
+
+def app_html_response(request: Request) -> Response:
+    """Build the UI page response."""
+    return APP_HTML_ASSET.response(request)
+
+
 @ui_router.get("/app", response_class=HTMLResponse)
-async def serve_app() -> HTMLResponse:
+async def serve_app(request: Request) -> Response:
     """Serve the single-page UI at /app."""
-    return HTMLResponse(content=APP_HTML)
+    return app_html_response(request)
 
 
 @ui_router.get("/", response_class=HTMLResponse)
-async def serve_root() -> HTMLResponse:
+async def serve_root(request: Request) -> Response:
     """Serve the single-page UI at root."""
-    return HTMLResponse(content=APP_HTML)
+    return app_html_response(request)
+
+
+@ui_router.get("/ui/app.css")
+async def serve_css(request: Request) -> Response:
+    """Serve the non-critical stylesheet."""
+    return APP_CSS_ASSET.response(request)
+
+
+@ui_router.get("/ui/app.js")
+async def serve_js(request: Request) -> Response:
+    """Serve the page script."""
+    return APP_JS_ASSET.response(request)
@@ -1,15 +1,50 @@
 """Utilities for health checks and connection validation"""
 
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
 import httpx
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared across checks so repeated probes reuse pooled keep-alive connections
+_client: Optional[httpx.AsyncClient] = None
+
+# How long a probe result is reused before hitting the server again
+PROBE_TTL_SECONDS = 2.0
+
+# base_url -> (expires_at, reachable), and probes currently running per base_url
+_probe_results: Dict[str, Tuple[float, bool]] = {}
+_probes_in_flight: Dict[str, "asyncio.Task[bool]"] = {}
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def check_ollama_connection(base_url: str, timeout: float = 5.0) -> bool:
     """
     Check if Ollama server is reachable and responding.
     
+    Results are reused for PROBE_TTL_SECONDS, and concurrent callers for the
+    same server share a single in-flight probe.
+    
     Args:
         base_url: Base URL of Ollama server (e.g., http://localhost:11434)
         timeout: Timeout in seconds
@@ -17,10 +52,31 @@ async def check_ollama_connection(base_url: str, timeout: float = 5.0) -> bool:
     Returns:
         True if Ollama is reachable, False otherwise
     """
+    cached = _probe_results.get(base_url)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+    
+    probe = _probes_in_flight.get(base_url)
+    if probe is None:
+        probe = asyncio.ensure_future(_probe_ollama(base_url, timeout))
+        _probes_in_flight[base_url] = probe
+        probe.add_done_callback(lambda _: _probes_in_flight.pop(base_url, None))
+    
+    return await asyncio.shield(probe)
+
+
+async def _probe_ollama(base_url: str, timeout: float) -> bool:
+    """Hit the Ollama server once and cache the outcome."""
+    client = _get_client()
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(f"{base_url}/api/tags")
-            return response.status_code == 200
+        # The root endpoint answers "Ollama is running" without listing models
+        response = await client.head(f"{base_url}/", timeout=timeout)
+        if response.status_code == 405:
+            response = await client.get(f"{base_url}/", timeout=timeout)
+        reachable = response.status_code == 200
     except Exception as e:
         logger.warning(f"Failed to connect to Ollama at {base_url}: {e}")
-        return False
+        reachable = False
+    
+    _probe_results[base_url] = (time.monotonic() + PROBE_TTL_SECONDS, reachable)
+    return reachable
@@ -3,84 +3,65 @@ End-to-end tests for Ollama provider integration
 Tests mixed provider scenarios and ensures backward compatibility with Google
 """
 
-import os
 import asyncio
 import logging
 import json
+import os
+import tempfile
+from functools import partial
+from pathlib import Path
+
+import pytest
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s | %(levelname)-8s | %(name)s:%(lineno)d | %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+_BANNER = "=" * 60
 
-async def test_providers_configuration():
+
+@pytest.mark.parametrize(
+    "llm_provider, embedding_provider, google_api_key",
+    [
+        ("google", "google", "test-key"),
+        ("ollama", "ollama", None),
+        ("google", "ollama", "test-key"),  # Mixed: Google LLM + Ollama embeddings
+    ],
+)
+def test_providers_configuration(monkeypatch, llm_provider, embedding_provider, google_api_key):
     """Test that provider configuration works correctly"""
-    logger.info("=" * 60)
-    logger.info("TEST: Providers Configuration")
-    logger.info("=" * 60)
-    
     from src.study_buddy.config.settings import Settings
     
-    # Test Google provider
-    logger.info("\n1. Testing Google provider configuration...")
-    os.environ["LLM_PROVIDER"] = "google"
-    os.environ["EMBEDDING_PROVIDER"] = "google"
-    os.environ["GOOGLE_API_KEY"] = "test-key"
-    
-    try:
-        settings = Settings()
-        logger.info(f"✓ Google LLM Provider: {settings.llm_provider} - Model: {settings.llm_model}")
-        logger.info(f"✓ Google Embedding Provider: {settings.embedding_provider} - Model: {settings.embedding_model_name}")
-        logger.info(f"✓ Dimension: {settings.embedding_dimension}")
-    except Exception as e:
-        logger.error(f"✗ Google provider configuration failed: {e}")
-        return False
-    
-    # Test Ollama provider
-    logger.info("\n2. Testing Ollama provider configuration...")
-    os.environ["LLM_PROVIDER"] = "ollama"
-    os.environ["EMBEDDING_PROVIDER"] = "ollama"
-    os.environ.pop("GOOGLE_API_KEY", None)
-    
-    try:
-        settings = Settings()
-        logger.info(f"✓ Ollama LLM Provider: {settings.llm_provider} - Model: {settings.ollama_llm_model}")
-        logger.info(f"✓ Ollama Embedding Provider: {settings.embedding_provider} - Model: {settings.ollama_embedding_model}")
-        logger.info(f"✓ Ollama Base URL: {settings.ollama_base_url}")
-        logger.info(f"✓ Provider info: {settings.get_provider_info()}")
-    except Exception as e:
-        logger.error(f"✗ Ollama provider configuration failed: {e}")
-        return False
-    
-    # Test mixed providers
-    logger.info("\n3. Testing mixed provider configuration (Google LLM + Ollama Embeddings)...")
-    os.environ["LLM_PROVIDER"] = "google"
-    os.environ["EMBEDDING_PROVIDER"] = "ollama"
-    os.environ["GOOGLE_API_KEY"] = "test-key"
-    
-    try:
-        settings = Settings()
-        logger.info(f"✓ LLM Provider: {settings.llm_provider}")
-        logger.info(f"✓ Embedding Provider: {settings.embedding_provider}")
-        logger.info(f"✓ Full config: {settings.get_provider_info()}")
-    except Exception as e:
-        logger.error(f"✗ Mixed provider configuration failed: {e}")
-        return False
-    
-    logger.info("\n✓ All provider configurations passed!")
-    return True
+    # monkeypatch restores the environment afterwards, so cases stay isolated
+    monkeypatch.setenv("LLM_PROVIDER", llm_provider)
+    monkeypatch.setenv("EMBEDDING_PROVIDER", embedding_provider)
+    if google_api_key:
+        monkeypatch.setenv("GOOGLE_API_KEY", google_api_key)
+    else:
+        monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    
+    settings = Settings()
+    logger.info(f"✓ Provider info: {settings.get_provider_info()}")
+    
+    assert settings.llm_provider == llm_provider
+    assert settings.embedding_provider == embedding_provider
+    if llm_provider == "ollama":
+        assert settings.llm_model == settings.ollama_llm_model
+    if embedding_provider == "ollama":
+        assert settings.embedding_model_name == settings.ollama_embedding_model
 
 
-async def test_embeddings_factory():
+def test_embeddings_factory():
     """Test that embeddings factory creates correct instances"""
-    logger.info("\n" + "=" * 60)
+    logger.info("\n" + _BANNER)
     logger.info("TEST: Embeddings Factory")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     
+    # Skip (rather than crash) when a provider integration is not installed
+    GoogleGenerativeAIEmbeddings = pytest.importorskip("langchain_google_genai").GoogleGenerativeAIEmbeddings
+    OllamaEmbeddings = pytest.importorskip("langchain_ollama").OllamaEmbeddings
     from src.study_buddy.rag_qa.vectorstore import create_embeddings
-    from langchain_google_genai import GoogleGenerativeAIEmbeddings
-    from langchain_ollama import OllamaEmbeddings
     
     # Test Google embeddings
     logger.info("\n1. Testing Google embeddings factory...")
@@ -94,7 +75,7 @@ async def test_embeddings_factory():
         logger.info(f"✓ Created Google embeddings: {type(embeddings).__name__}")
     except Exception as e:
         logger.error(f"✗ Google embeddings factory failed: {e}")
-        return False
+        raise
     
     # Test Ollama embeddings
     logger.info("\n2. Testing Ollama embeddings factory...")
@@ -107,21 +88,20 @@ async def test_embeddings_factory():
         logger.info(f"✓ Created Ollama embeddings: {type(embeddings).__name__}")
     except Exception as e:
         logger.error(f"✗ Ollama embeddings factory failed: {e}")
-        return False
+        raise
     
     logger.info("\n✓ Embeddings factory tests passed!")
-    return True
 
 
-async def test_llm_factory():
+def test_llm_factory():
     """Test that LLM factory creates correct instances"""
-    logger.info("\n" + "=" * 60)
+    logger.info("\n" + _BANNER)
     logger.info("TEST: LLM Factory")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     
+    ChatGoogleGenerativeAI = pytest.importorskip("langchain_google_genai").ChatGoogleGenerativeAI
+    ChatOllama = pytest.importorskip("langchain_ollama").ChatOllama
     from src.study_buddy.agent.study_agent import create_llm
-    from langchain_google_genai import ChatGoogleGenerativeAI
-    from langchain_ollama import ChatOllama
     
     # Test Google LLM
     logger.info("\n1. Testing Google LLM factory...")
@@ -135,7 +115,7 @@ async def test_llm_factory():
         logger.info(f"✓ Created Google LLM: {type(llm).__name__}")
     except Exception as e:
         logger.error(f"✗ Google LLM factory failed: {e}")
-        return False
+        raise
     
     # Test Ollama LLM
     logger.info("\n2. Testing Ollama LLM factory...")
@@ -148,160 +128,148 @@ async def test_llm_factory():
         logger.info(f"✓ Created Ollama LLM: {type(llm).__name__}")
     except Exception as e:
         logger.error(f"✗ Ollama LLM factory failed: {e}")
-        return False
+        raise
     
     logger.info("\n✓ LLM factory tests passed!")
-    return True
 
 
-async def test_rag_pipeline_initialization():
+def test_rag_pipeline_initialization(tmp_path: Path):
     """Test RAGPipeline initialization with different providers"""
-    logger.info("\n" + "=" * 60)
+    logger.info("\n" + _BANNER)
     logger.info("TEST: RAG Pipeline Initialization")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     
     from src.study_buddy.rag_qa.qa import RAGPipeline
-    from pathlib import Path
-    import tempfile
     
     # Test with Google embeddings
     logger.info("\n1. Testing RAG Pipeline with Google embeddings...")
     try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            pipeline = RAGPipeline(
-                embedding_provider="google",
-                google_api_key="test-key",
-                faiss_index_path=Path(tmpdir) / "indices",
-                metadata_path=Path(tmpdir) / "metadata",
-            )
-            logger.info("✓ RAG Pipeline created with Google embeddings")
-            logger.info(f"  - Provider: {pipeline.embedding_provider}")
+        pipeline = RAGPipeline(
+            embedding_provider="google",
+            google_api_key="test-key",
+            faiss_index_path=tmp_path / "google" / "indices",
+            metadata_path=tmp_path / "google" / "metadata",
+        )
+        logger.info("✓ RAG Pipeline created with Google embeddings")
+        logger.info(f"  - Provider: {pipeline.embedding_provider}")
     except Exception as e:
         logger.error(f"✗ RAG Pipeline with Google failed: {e}")
-        return False
+        raise
     
     # Test with Ollama embeddings
     logger.info("\n2. Testing RAG Pipeline with Ollama embeddings...")
     try:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            pipeline = RAGPipeline(
-                embedding_provider="ollama",
-                ollama_embedding_model="nomic-embed-text:latest",
-                faiss_index_path=Path(tmpdir) / "indices",
-                metadata_path=Path(tmpdir) / "metadata",
-            )
-            logger.info("✓ RAG Pipeline created with Ollama embeddings")
-            logger.info(f"  - Provider: {pipeline.embedding_provider}")
+        pipeline = RAGPipeline(
+            embedding_provider="ollama",
+            ollama_embedding_model="nomic-embed-text:latest",
+            faiss_index_path=tmp_path / "ollama" / "indices",
+            metadata_path=tmp_path / "ollama" / "metadata",
+        )
+        logger.info("✓ RAG Pipeline created with Ollama embeddings")
+        logger.info(f"  - Provider: {pipeline.embedding_provider}")
     except Exception as e:
         logger.error(f"✗ RAG Pipeline with Ollama failed: {e}")
-        return False
+        raise
     
     logger.info("\n✓ RAG Pipeline initialization tests passed!")
-    return True
 
 
-async def test_study_agent_initialization():
+def test_study_agent_initialization(tmp_path: Path):
     """Test StudyAgent initialization with different providers"""
-    logger.info("\n" + "=" * 60)
+    logger.info("\n" + _BANNER)
     logger.info("TEST: Study Agent Initialization")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     
     from src.study_buddy.agent.study_agent import StudyAgent
     from src.study_buddy.rag_qa.qa import RAGPipeline
-    from pathlib import Path
-    import tempfile
     
-    # Create a test pipeline
-    with tempfile.TemporaryDirectory() as tmpdir:
-        pipeline = RAGPipeline(
-            embedding_provider="ollama",
-            faiss_index_path=Path(tmpdir) / "indices",
-            metadata_path=Path(tmpdir) / "metadata",
+    # One pipeline shared by both agent variants
+    pipeline = RAGPipeline(
+        embedding_provider="ollama",
+        faiss_index_path=tmp_path / "indices",
+        metadata_path=tmp_path / "metadata",
+    )
+    
+    # Test with Google LLM
+    logger.info("\n1. Testing StudyAgent with Google LLM...")
+    try:
+        agent = StudyAgent(
+            pipeline=pipeline,
+            llm_provider="google",
+            llm_model="gemini-2.0-flash",
+            google_api_key="test-key"
         )
-        
-        # Test with Google LLM
-        logger.info("\n1. Testing StudyAgent with Google LLM...")
-        try:
-            agent = StudyAgent(
-                pipeline=pipeline,
-                llm_provider="google",
-                llm_model="gemini-2.0-flash",
-                google_api_key="test-key"
-            )
-            logger.info("✓ StudyAgent created with Google LLM")
-            logger.info(f"  - Provider: {agent.llm_provider}")
-            logger.info(f"  - Model: {agent.llm_model}")
-            logger.info(f"  - Tools: {[tool.name for tool in agent.tools]}")
-        except Exception as e:
-            logger.error(f"✗ StudyAgent with Google LLM failed: {e}")
-            return False
-        
-        # Test with Ollama LLM
-        logger.info("\n2. Testing StudyAgent with Ollama LLM...")
-        try:
-            agent = StudyAgent(
-                pipeline=pipeline,
-                llm_provider="ollama",
-                llm_model="gemma3:4b"
-            )
-            logger.info("✓ StudyAgent created with Ollama LLM")
-            logger.info(f"  - Provider: {agent.llm_provider}")
-            logger.info(f"  - Model: {agent.llm_model}")
-            logger.info(f"  - Tools: {[tool.name for tool in agent.tools]}")
-        except Exception as e:
-            logger.error(f"✗ StudyAgent with Ollama LLM failed: {e}")
-            return False
+        logger.info("✓ StudyAgent created with Google LLM")
+        logger.info(f"  - Provider: {agent.llm_provider}")
+        logger.info(f"  - Model: {agent.llm_model}")
+        logger.info(f"  - Tools: {[tool.name for tool in agent.tools]}")
+    except Exception as e:
+        logger.error(f"✗ StudyAgent with Google LLM failed: {e}")
+        raise
+    
+    # Test with Ollama LLM
+    logger.info("\n2. Testing StudyAgent with Ollama LLM...")
+    try:
+        agent = StudyAgent(
+            pipeline=pipeline,
+            llm_provider="ollama",
+            llm_model="gemma3:4b"
+        )
+        logger.info("✓ StudyAgent created with Ollama LLM")
+        logger.info(f"  - Provider: {agent.llm_provider}")
+        logger.info(f"  - Model: {agent.llm_model}")
+        logger.info(f"  - Tools: {[tool.name for tool in agent.tools]}")
+    except Exception as e:
+        logger.error(f"✗ StudyAgent with Ollama LLM failed: {e}")
+        raise
     
     logger.info("\n✓ Study Agent initialization tests passed!")
-    return True
 
 
-async def test_api_endpoints():
+def test_api_endpoints():
     """Test that API endpoints are correctly set up"""
-    logger.info("\n" + "=" * 60)
+    logger.info("\n" + _BANNER)
     logger.info("TEST: API Endpoints")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     
     try:
-        from src.study_buddy.main import app
-        from fastapi.testclient import TestClient
-        
-        client = TestClient(app)
-        
-        # Test root endpoint
-        logger.info("\n1. Testing root endpoint (/)...")
-        response = client.get("/")
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"✓ Root endpoint returns: {data}")
-        assert "name" in data
-        assert "providers" in data
-        logger.info(f"  - Providers: {data['providers']}")
-        
-        # Test providers endpoint
-        logger.info("\n2. Testing providers endpoint (/providers)...")
-        response = client.get("/providers")
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"✓ Providers endpoint returns: {json.dumps(data, indent=2)}")
-        assert "llm_provider" in data
-        assert "embedding_provider" in data
+        # Settings validation needs a Google key for the default provider; keep any real one
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setenv("GOOGLE_API_KEY", os.environ.get("GOOGLE_API_KEY", "test-key"))
+            from src.study_buddy.main import app
+            from fastapi.testclient import TestClient
+            
+            client = TestClient(app)
+            
+            # Test root endpoint
+            logger.info("\n1. Testing root endpoint (/)...")
+            response = client.get("/")
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/html")
+            logger.info(f"✓ Root endpoint serves the UI ({len(response.content)} bytes)")
+            
+            # Test providers endpoint
+            logger.info("\n2. Testing providers endpoint (/providers)...")
+            response = client.get("/providers")
+            assert response.status_code == 200
+            data = response.json()
+            logger.info(f"✓ Providers endpoint returns: {json.dumps(data, indent=2)}")
+            assert "llm_provider" in data
+            assert "embedding_provider" in data
+            
+            # Test health endpoint
+            logger.info("\n3. Testing health endpoint (/health)...")
+            response = client.get("/health")
+            assert response.status_code == 200
+            data = response.json()
+            logger.info(f"✓ Health endpoint returns: {data}")
+            assert data["status"] == "healthy"
         
-        # Test health endpoint
-        logger.info("\n3. Testing health endpoint (/health)...")
-        response = client.get("/health")
-        assert response.status_code == 200
-        data = response.json()
-        logger.info(f"✓ Health endpoint returns: {data}")
-        
-    except Exception as e:
-        logger.error(f"✗ API endpoints test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    except Exception:
+        logger.exception("✗ API endpoints test failed")
+        raise
     
     logger.info("\n✓ API endpoints tests passed!")
-    return True
 
 
 async def run_all_tests():
@@ -315,43 +283,61 @@ async def run_all_tests():
     
     results = {}
     
-    tests = [
-        ("Provider Configuration", test_providers_configuration),
-        ("Embeddings Factory", test_embeddings_factory),
-        ("LLM Factory", test_llm_factory),
-        ("RAG Pipeline Initialization", test_rag_pipeline_initialization),
-        ("Study Agent Initialization", test_study_agent_initialization),
-        ("API Endpoints", test_api_endpoints),
-    ]
+    # One scratch directory for the run; each test gets its own subdirectory
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base = Path(tmpdir)
+        tests = [
+            ("Embeddings Factory", test_embeddings_factory),
+            ("LLM Factory", test_llm_factory),
+            ("RAG Pipeline Initialization", partial(test_rag_pipeline_initialization, base / "rag")),
+            ("Study Agent Initialization", partial(test_study_agent_initialization, base / "agent")),
+            ("API Endpoints", test_api_endpoints),
+        ]
+        
+        # The checks are independent blocking setup, so each runs on its own
+        # worker thread to actually overlap
+        outcomes = await asyncio.gather(
+            *(asyncio.to_thread(test_func) for _, test_func in tests),
+            return_exceptions=True,
+        )
     
-    for test_name, test_func in tests:
-        try:
-            result = await test_func()
-            results[test_name] = "✓ PASSED" if result else "✗ FAILED"
-        except Exception as e:
-            logger.error(f"✗ {test_name} crashed: {e}")
-            import traceback
-            traceback.print_exc()
+    for (test_name, _), outcome in zip(tests, outcomes):
+        if isinstance(outcome, pytest.skip.Exception):
+            logger.info(f"- {test_name} skipped: {outcome.msg}")
+            results[test_name] = "- SKIPPED"
+        elif isinstance(outcome, AssertionError):
+            logger.error("✗ %s failed: %s", test_name, outcome, exc_info=outcome)
+            results[test_name] = "✗ FAILED"
+        elif isinstance(outcome, Exception):
+            logger.error("✗ %s crashed: %s", test_name, outcome, exc_info=outcome)
             results[test_name] = "✗ CRASHED"
+        else:
+            results[test_name] = "✓ PASSED"
     
     # Print summary
     logger.info("\n")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     logger.info("TEST SUMMARY")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     
     passed = sum(1 for v in results.values() if "PASSED" in v)
+    skipped = sum(1 for v in results.values() if "SKIPPED" in v)
     total = len(results)
     
     for test_name, result in results.items():
-        status_symbol = "[PASS]" if "PASSED" in result else "[FAIL]"
+        if "PASSED" in result:
+            status_symbol = "[PASS]"
+        elif "SKIPPED" in result:
+            status_symbol = "[SKIP]"
+        else:
+            status_symbol = "[FAIL]"
         logger.info(f"{status_symbol:12} | {test_name}")
     
-    logger.info("=" * 60)
-    logger.info(f"Total: {passed}/{total} tests passed")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
+    logger.info(f"Total: {passed}/{total} tests passed, {skipped} skipped")
+    logger.info(_BANNER)
     
-    return passed == total
+    return passed + skipped == total
 
 
 if __name__ == "__main__":
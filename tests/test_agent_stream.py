@@ -0,0 +1,114 @@
+"""
+Tests for the /agent/stream Server-Sent Events endpoint
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.study_buddy.agent import study_agent
+from src.study_buddy.agent.study_agent import StudyAgent
+from src.study_buddy.api.agent_router import agent_router
+from src.study_buddy.models import AgentRequest
+from src.study_buddy.rag_qa.qa import RAGPipeline
+
+ANSWER = "Photosynthesis turns light into sugar."
+
+
+def _make_client(monkeypatch, tmp_path, llm):
+    """Build an app serving agent_router with a StudyAgent backed by a fake chat model"""
+    monkeypatch.setattr(study_agent, "create_llm", lambda **kwargs: llm)
+    
+    pipeline = RAGPipeline(
+        embedding_provider="ollama",
+        faiss_index_path=tmp_path / "indices",
+        metadata_path=tmp_path / "metadata",
+    )
+    agent = StudyAgent(pipeline=pipeline, llm_provider="ollama", llm_model="fake")
+    
+    app = FastAPI()
+    app.include_router(agent_router)
+    app.state.study_agent = agent
+    return TestClient(app), agent
+
+
+def _events(response):
+    """Parse an SSE response body into its JSON events"""
+    return [
+        json.loads(raw[len("data: "):])
+        for raw in response.text.split("\n\n")
+        if raw.startswith("data: ")
+    ]
+
+
+def test_stream_explain_events(monkeypatch, tmp_path):
+    """An explain request streams start, deltas, then done, and records the answer"""
+    client, agent = _make_client(monkeypatch, tmp_path, FakeListChatModel(responses=[ANSWER]))
+    
+    response = client.post("/agent/stream", json={"mode": "explain", "input": "What is photosynthesis?"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    
+    events = _events(response)
+    types = [e["type"] for e in events]
+    assert types[0] == "start"
+    assert types[-1] == "done"
+    assert set(types[1:-1]) == {"delta"}
+    assert len(types) > 3
+    
+    assert "".join(e["text"] for e in events if e["type"] == "delta") == ANSWER
+    assert events[-1]["message"] == ANSWER
+    
+    session = agent.session_manager.get_session(events[0]["session_id"])
+    assert [m.content for m in session.messages] == ["What is photosynthesis?", ANSWER]
+
+
+@pytest.mark.parametrize("mode", ["summarize", "mcq", "flashcards", "auto-study"])
+def test_stream_rejects_other_modes(monkeypatch, tmp_path, mode):
+    """Only explain mode can be streamed"""
+    client, _ = _make_client(monkeypatch, tmp_path, FakeListChatModel(responses=[ANSWER]))
+    
+    response = client.post("/agent/stream", json={"mode": mode, "input": "photosynthesis", "doc_id": "doc"})
+    
+    assert response.status_code == 400
+
+
+def test_stream_failure_keeps_partial_answer(monkeypatch, tmp_path):
+    """A stream failing mid-answer ends with an error event and records the partial text"""
+    llm = FakeListChatModel(responses=[ANSWER], error_on_chunk_number=5)
+    client, agent = _make_client(monkeypatch, tmp_path, llm)
+    
+    response = client.post("/agent/stream", json={"mode": "explain", "input": "What is photosynthesis?"})
+    
+    events = _events(response)
+    assert events[-1]["type"] == "error"
+    partial = "".join(e["text"] for e in events if e["type"] == "delta")
+    assert partial and partial != ANSWER
+    
+    session = agent.session_manager.get_session(events[0]["session_id"])
+    assert [m.content for m in session.messages] == ["What is photosynthesis?", partial]
+
+
+def test_stream_disconnect_records_partial_answer(monkeypatch, tmp_path):
+    """Closing the stream mid-answer still records the text generated so far"""
+    _, agent = _make_client(monkeypatch, tmp_path, FakeListChatModel(responses=[ANSWER]))
+    request = AgentRequest(mode="explain", input="What is photosynthesis?")
+    
+    async def consume_until_first_delta():
+        stream = agent.stream_explain(request)
+        async for event in stream:
+            if event["type"] == "start":
+                session_id = event["session_id"]
+            elif event["type"] == "delta":
+                await stream.aclose()
+                return session_id, event["text"]
+    
+    session_id, first_delta = asyncio.run(consume_until_first_delta())
+    
+    session = agent.session_manager.get_session(session_id)
+    assert [m.content for m in session.messages] == ["What is photosynthesis?", first_delta.strip()]
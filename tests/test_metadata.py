@@ -0,0 +1,54 @@
+"""
+Tests for MetadataStore chunk lookups and their cache
+"""
+
+from src.study_buddy.storage.metadata import MetadataStore
+
+
+def _chunks(doc_id, texts):
+    return [
+        {"text": text, "chunk_id": f"{doc_id}_{i}", "doc_id": doc_id, "chunk_index": i, "metadata": {"page": i + 1}}
+        for i, text in enumerate(texts)
+    ]
+
+
+def test_lookup_by_id_and_index(tmp_path):
+    """Chunks are found by chunk_id and by chunk_index"""
+    store = MetadataStore(tmp_path)
+    store.save_metadata("doc", _chunks("doc", ["alpha", "beta", "gamma"]))
+    
+    assert store.get_chunk_metadata("doc", "doc_1")["text"] == "beta"
+    assert store.get_chunk_by_index("doc", 2)["text"] == "gamma"
+    assert [c["text"] for c in store.get_all_chunks_metadata("doc")] == ["alpha", "beta", "gamma"]
+    
+    assert store.get_chunk_metadata("doc", "doc_9") is None
+    assert store.get_chunk_by_index("doc", 9) is None
+    assert store.get_chunk_metadata("missing", "missing_0") is None
+    assert store.get_all_chunks_metadata("missing") == []
+
+
+def test_results_do_not_alias_the_cache(tmp_path):
+    """Mutating returned chunks leaves later lookups untouched"""
+    store = MetadataStore(tmp_path)
+    store.save_metadata("doc", _chunks("doc", ["alpha", "beta"]))
+    
+    store.get_chunk_metadata("doc", "doc_0")["text"] = "changed"
+    store.get_chunk_by_index("doc", 1)["metadata"]["page"] = 99
+    store.get_all_chunks_metadata("doc").clear()
+    
+    assert store.get_chunk_metadata("doc", "doc_0")["text"] == "alpha"
+    assert store.get_chunk_by_index("doc", 1)["metadata"]["page"] == 2
+    assert len(store.get_all_chunks_metadata("doc")) == 2
+
+
+def test_save_metadata_invalidates_lookups(tmp_path):
+    """Lookups reflect the latest save_metadata for a document"""
+    store = MetadataStore(tmp_path)
+    store.save_metadata("doc", _chunks("doc", ["alpha", "beta"]))
+    assert store.get_chunk_by_index("doc", 1)["text"] == "beta"
+    
+    store.save_metadata("doc", _chunks("doc", ["alpha", "beta revised", "gamma"]))
+    
+    assert store.get_chunk_by_index("doc", 1)["text"] == "beta revised"
+    assert store.get_chunk_metadata("doc", "doc_2")["text"] == "gamma"
+    assert len(store.get_all_chunks_metadata("doc")) == 3
@@ -0,0 +1,61 @@
+"""
+Tests for the UI static asset responses
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.study_buddy.ui.app_ui import APP_CSS_ASSET, APP_JS_ASSET, ui_router
+
+IMMUTABLE = "public, max-age=86400, immutable"
+VERSIONED_ASSETS = [("/ui/app.css", APP_CSS_ASSET), ("/ui/app.js", APP_JS_ASSET)]
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(ui_router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path, asset", VERSIONED_ASSETS)
+def test_current_version_is_immutable(client, path, asset):
+    """Only a URL naming the current version is cached as immutable"""
+    response = client.get(path, params={"v": asset.version})
+    
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == IMMUTABLE
+
+
+@pytest.mark.parametrize("path, asset", VERSIONED_ASSETS)
+@pytest.mark.parametrize("params", [{"v": "00000000"}, {}])
+def test_other_versions_revalidate(client, path, asset, params):
+    """A stale or missing ?v= gets the current body without pinning it in caches"""
+    response = client.get(path, params=params)
+    
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+    
+    revalidated = client.get(path, params=params, headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["cache-control"] == "no-cache"
+
+
+@pytest.mark.parametrize("path, asset", VERSIONED_ASSETS)
+def test_each_encoding_has_its_own_etag(client, path, asset):
+    """Identity and gzip bodies carry distinct strong ETags, and either revalidates"""
+    identity = client.get(path, headers={"Accept-Encoding": "identity"})
+    gzipped = client.get(path, headers={"Accept-Encoding": "gzip"})
+    
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert identity.headers["etag"] == asset.etag
+    assert gzipped.headers["etag"] == asset.gzip_etag
+    assert asset.etag != asset.gzip_etag
+    
+    for etag in (asset.etag, asset.gzip_etag):
+        for encoding in ("identity", "gzip"):
+            revalidated = client.get(path, headers={"If-None-Match": etag, "Accept-Encoding": encoding})
+            assert revalidated.status_code == 304
+            assert revalidated.headers["etag"] == etag
@@ -0,0 +1,129 @@
+"""
+Tests for FAISSVectorStore index building and the chunk embedding cache
+"""
+
+import hashlib
+import logging
+from typing import List
+
+import faiss
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.study_buddy.ingestion.chunker import DocumentChunk
+from src.study_buddy.rag_qa.qa import RAGPipeline
+from src.study_buddy.rag_qa.vectorstore import FAISSVectorStore
+
+
+class RecordingEmbeddings(Embeddings):
+    """Deterministic offline embeddings that record every embed_documents call"""
+    
+    def __init__(self, dim: int = 8):
+        self.dim = dim
+        self.calls: List[List[str]] = []
+    
+    def _vector(self, text: str) -> List[float]:
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [b / 255 for b in digest[:self.dim]]
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [self._vector(t) for t in texts]
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text)
+
+
+def _chunks(doc_id: str, texts: List[str]) -> List[DocumentChunk]:
+    return [
+        DocumentChunk(text=text, chunk_id=f"{doc_id}_{i}", doc_id=doc_id, chunk_index=i)
+        for i, text in enumerate(texts)
+    ]
+
+
+def _store(tmp_path) -> FAISSVectorStore:
+    store = FAISSVectorStore(index_path=tmp_path, embedding_provider="ollama")
+    store.embeddings = RecordingEmbeddings()
+    return store
+
+
+def test_reingest_unchanged_document_reuses_index(tmp_path):
+    """Re-ingesting identical chunks loads the existing index without embedding"""
+    store = _store(tmp_path)
+    
+    store.create_index("doc", _chunks("doc", ["alpha", "beta", "gamma"]))
+    store.create_index("doc", _chunks("doc", ["alpha", "beta", "gamma"]))
+    
+    assert store.embeddings.calls == [["alpha", "beta", "gamma"]]
+
+
+def test_reingest_changed_document_embeds_only_new_chunks(tmp_path):
+    """Re-ingesting with one edited chunk rebuilds the index, embedding just that chunk"""
+    store = _store(tmp_path)
+    
+    store.create_index("doc", _chunks("doc", ["alpha", "beta", "gamma"]))
+    store.create_index("doc", _chunks("doc", ["alpha", "beta revised", "gamma"]))
+    
+    assert store.embeddings.calls == [["alpha", "beta", "gamma"], ["beta revised"]]
+    
+    # The rebuilt index is served, both from memory and after reloading from disk
+    doc, _ = store.search("doc", "beta revised", k=1)[0]
+    assert doc.page_content == "beta revised"
+    
+    store.vectorstores.delete("doc")
+    doc, _ = store.search("doc", "beta revised", k=1)[0]
+    assert doc.page_content == "beta revised"
+
+
+@pytest.mark.parametrize("normalize_L2", [False, True])
+def test_search_batch_matches_search(tmp_path, normalize_L2):
+    """A batched search returns the same hits and scores as one search per query"""
+    store = _store(tmp_path)
+    store.create_index("doc", _chunks("doc", ["alpha", "beta", "gamma", "delta"]))
+    store.vectorstores.get("doc")._normalize_L2 = normalize_L2
+    queries = ["beta", "something else"]
+    
+    batch = store.search_batch("doc", queries, k=3)
+    
+    assert len(batch) == len(queries)
+    for query, batch_results in zip(queries, batch):
+        single_results = store.search("doc", query, k=3)
+        assert [d.page_content for d, _ in batch_results] == [d.page_content for d, _ in single_results]
+        assert [s for _, s in batch_results] == pytest.approx([float(s) for _, s in single_results])
+
+
+def test_search_batch_pads_short_indices_and_unknown_docs(tmp_path):
+    """k beyond the index size yields fewer hits, and unknown documents yield empty lists"""
+    store = _store(tmp_path)
+    store.create_index("doc", _chunks("doc", ["alpha", "beta"]))
+    
+    assert [len(r) for r in store.search_batch("doc", ["alpha", "beta"], k=5)] == [2, 2]
+    assert store.search_batch("missing", ["alpha", "beta"]) == [[], []]
+
+
+def test_query_batch_matches_query(tmp_path):
+    """RAGPipeline.query_batch builds the same answers as one query per question"""
+    pipeline = RAGPipeline(
+        embedding_provider="ollama",
+        faiss_index_path=tmp_path / "indices",
+        metadata_path=tmp_path / "metadata",
+    )
+    pipeline.vectorstore.embeddings = RecordingEmbeddings()
+    pipeline.vectorstore.create_index("doc", _chunks("doc", ["alpha", "beta", "gamma"]))
+    questions = ["alpha", "gamma"]
+    
+    assert pipeline.query_batch("doc", questions, k=2) == [pipeline.query("doc", q, k=2) for q in questions]
+
+
+def test_use_gpu_falls_back_to_cpu(tmp_path, monkeypatch, caplog):
+    """Without GPU support in faiss, use_gpu logs a warning and serves CPU indices"""
+    monkeypatch.delattr(faiss, "StandardGpuResources", raising=False)
+    
+    with caplog.at_level(logging.WARNING):
+        store = FAISSVectorStore(index_path=tmp_path, embedding_provider="ollama", use_gpu=True)
+    store.embeddings = RecordingEmbeddings()
+    
+    assert "no GPU support" in caplog.text
+    store.create_index("doc", _chunks("doc", ["alpha", "beta"]))
+    assert isinstance(store.vectorstores.get("doc").index, faiss.IndexFlat)
+    assert store.search("doc", "alpha", k=1)[0][0].page_content == "alpha"